@@ -16,7 +16,6 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
-from nltk.tokenize import word_tokenize
 
 
 class SourceItemImport( object ):
@@ -16,19 +16,129 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
+import re
 import logging
-from nltk.tokenize import word_tokenize
 from gencrud.config.listview import TemplateListView
 from gencrud.config.relation import TemplateRelation
 from gencrud.config.ui import TemplateUi
 from gencrud.config.tab import TemplateTab
 from gencrud.config.base import TemplateBase
-from gencrud.util.exceptions import InvalidSetting
+from gencrud.util.exceptions import InvalidFieldDefinition
 from gencrud.constants import *
 import gencrud.util.utils as root
 from gencrud.util.exceptions import MissingAttribute
 logger = logging.getLogger()
 
+# The tokens of the 'field' definition:
+#   <name> <type> [ ( <length> ) ] [ NULL | NOT NULL | DEFAULT <value> | PRIMARY KEY | AUTO NUMBER |
+#                                    FOREIGN KEY <reference> | INDEX ]...
+FIELD_TOKEN = re.compile( r"""\s*(?:(?P<punct>[(),])|(?P<string>'[^']*'|"[^"]*")|(?P<word>[^\s(),'"]+))""" )
+
+
+def tokenizeField( table_name, field_data ):
+    tokens = []
+    position = 0
+    while field_data[ position: ].strip() != '':
+        match = FIELD_TOKEN.match( field_data, position )
+        if match is None:
+            # Only an unterminated string does not match
+            position = field_data.index( field_data[ position: ].lstrip()[ 0 ], position )
+            raise InvalidFieldDefinition( table_name, field_data, position, 'unterminated string' )
+
+        if match.lastgroup is not None:
+            tokens.append( ( match.group( match.lastgroup ), match.start( match.lastgroup ) ) )
+
+        position = match.end()
+
+    tokens.append( ( None, len( field_data ) ) )
+    return tokens
+
+
+def defaultValue( attr ):
+    """Returns the value of a 'DEFAULT <value>' attribute, without the quotes of a string value."""
+    value = attr.split( ' ', 1 )[ 1 ]
+    if len( value ) > 1 and value[ 0 ] == value[ -1 ] and value[ 0 ] in ( "'", '"' ):
+        value = value[ 1:-1 ]
+
+    return value
+
+
+def pythonString( value ):
+    return '"{0}"'.format( value.replace( '\\', '\\\\' ).replace( '"', '\\"' ) )
+
+
+def parseField( table_name, field_data, sql_types ):
+    """Parses the 'field' definition of a column.
+
+    :returns:   tuple with the field name, the sql type, the length and the list of attributes.
+    """
+    tokens = tokenizeField( table_name, field_data )
+    offset = 0
+
+    def expect( *expected ):
+        nonlocal offset
+        value, position = tokens[ offset ]
+        if value is None or ( len( expected ) > 0 and value not in expected ):
+            found = 'end of field' if value is None else '"{}"'.format( value )
+            raise InvalidFieldDefinition( table_name, field_data, position,
+                                          'expected {} but found {}'.format( ' or '.join( expected ) or 'a value',
+                                                                             found ) )
+
+        offset += 1
+        return value
+
+    field = expect()
+    sqlType, position = tokens[ offset ]
+    if sqlType not in sql_types:
+        raise InvalidFieldDefinition( table_name, field_data, position,
+                                      'invalid type {}, expected one of {}'.format( sqlType, ', '.join( sql_types ) ) )
+
+    offset += 1
+    length = 0
+    if tokens[ offset ][ 0 ] == '(':
+        offset += 1
+        value, position = tokens[ offset ]
+        if value is None or not value.isdigit():
+            raise InvalidFieldDefinition( table_name, field_data, position, 'expected a length' )
+
+        length = int( value )
+        offset += 1
+        expect( ')' )
+
+    attrs = []
+    while tokens[ offset ][ 0 ] is not None:
+        value, position = tokens[ offset ]
+        offset += 1
+        if value == 'NULL':
+            attrs.append( 'NULL' )
+
+        elif value == 'NOT':
+            expect( 'NULL' )
+            attrs.append( 'NOT NULL' )
+
+        elif value == 'DEFAULT':
+            attrs.append( 'DEFAULT {0}'.format( expect() ) )
+
+        elif value == 'PRIMARY':
+            expect( 'KEY' )
+            attrs.append( 'PRIMARY KEY' )
+
+        elif value == 'AUTO':
+            expect( 'NUMBER' )
+            attrs.append( 'AUTO NUMBER' )
+
+        elif value == 'FOREIGN':
+            expect( 'KEY' )
+            attrs.append( 'FOREIGN KEY {0}'.format( expect() ) )
+
+        elif value == 'INDEX':
+            attrs.append( 'INDEX' )
+
+        else:
+            raise InvalidFieldDefinition( table_name, field_data, position, 'invalid attribute "{}"'.format( value ) )
+
+    return field, sqlType, length, attrs
+
 
 class TemplateColumn( TemplateBase ):
     TS_TYPES_FROM_SQL = { 'CHAR': 'string',
@@ -110,54 +220,10 @@ class TemplateColumn( TemplateBase ):
         if C_FIELD not in self.__config:
             raise MissingAttribute( C_TABLE, C_FIELD )
 
-        field_data = cfg.get( C_FIELD, '' )
-        tokens = [ x for x in word_tokenize( field_data ) ]
-        self.__dbField  = self.__field = tokens[ 0 ]
-        self.__sqlType  = tokens[ 1 ]
-        if self.__sqlType not in self.TS_TYPES_FROM_SQL:
-            raise InvalidSetting( C_FIELD, self.__tableName, self.__field, expected = self.TS_TYPES_FROM_SQL )
-
-        offset = 2
-        if offset < len( tokens ) and tokens[ offset ] == '(':
-            offset += 1
-            self.__length   = int( tokens[ offset ] )
-            offset += 2
-
-        # attributes
-        # NOT NULL
-        # DEFAULT <value>
-        # PRIMARY KEY
-        # AUTO NUMBER
-        # FOREIGN KEY <reference>
-        while offset < len( tokens ):
-            if tokens[ offset ] == 'NULL':
-                self.__attrs.append( 'NULL' )
-
-            elif tokens[ offset ] == 'NOT':
-                offset += 1
-                if tokens[ offset ] == 'NULL':
-                    self.__attrs.append( 'NOT NULL' )
-
-                else:
-                    raise InvalidSetting( C_FIELD, 'attr: "NOT ' + tokens[ offset ] + '"', self.__field )
-
-            elif tokens[ offset ] == 'DEFAULT':
-                self.__attrs.append( 'DEFAULT {0}'.format( tokens[ offset + 1 ] ) )
-
-            elif tokens[ offset ] == 'PRIMARY':
-                self.__attrs.append( 'PRIMARY KEY' )
-
-            elif tokens[ offset ] == 'AUTO':
-                self.__attrs.append( 'AUTO NUMBER' )
-
-            elif tokens[ offset ] == 'FOREIGN':
-                self.__attrs.append( 'FOREIGN KEY {0}'.format( tokens[ offset + 2 ] ) )
-                offset += 1
-
-            else:
-                raise InvalidSetting( C_FIELD, 'attr: "' + tokens[ offset ] + '"', self.__field )
-
-            offset += 2
+        field, self.__sqlType, self.__length, self.__attrs = parseField( self.__tableName,
+                                                                         cfg.get( C_FIELD, '' ),
+                                                                         self.TS_TYPES_FROM_SQL )
+        self.__dbField = self.__field = field
 
         if C_UI in cfg and type( cfg[ C_UI ] ) is dict:
             self.__ui = TemplateUi( self, **cfg.get( C_UI, {} ) )
@@ -271,6 +337,9 @@ class TemplateColumn( TemplateBase ):
     def hasUniqueKey( self ) -> bool:
         return C_UNIQUE_KEY in self.__config or C_UNIQUE in self.__config
 
+    def hasIndex( self ) -> bool:
+        return 'INDEX' in self.__attrs
+
     def hasForeignKey( self ) -> bool:
         return any( 'FOREIGN KEY' in x for x in self.__attrs )
         # return 'FOREIGN KEY' in self.__attrs
@@ -282,6 +351,16 @@ class TemplateColumn( TemplateBase ):
     def relationship( self ):
         return self.__relationShip
 
+    @property
+    def loading( self ):
+        """The loading strategy of the <field>_FK relationship; 'joined', 'selectin' or 'raise',
+        None for the default lazy loading.
+        """
+        if self.__ui is None or not self.hasForeignKey() or not self.__ui.hasService():
+            return None
+
+        return self.__config.get( C_LOADING, self.getObject().loading )
+
     @property
     def name( self ) -> str:
         return self.__field
@@ -393,6 +472,7 @@ class TemplateColumn( TemplateBase ):
                     'nullable': False,
                     'foreign_key': None,
                     'default': None,
+                    'index': False,
                   }
         for attr in self.__attrs:
             if 'AUTO NUMBER' in attr:
@@ -412,23 +492,26 @@ class TemplateColumn( TemplateBase ):
                     options['foreign_key'] = attr.split(' ')[ 2 ]
 
             elif attr.startswith( 'DEFAULT' ):
-                value = attr.split( ' ' )[ 1 ]
+                value = defaultValue( attr )
                 if self.isNumericField():
                     options[ 'default' ] = value
 
                 elif self.isBooleanField():
-                    if value.lower() == ( "true", "1", "yes" ):
+                    if value.lower() in ( "true", "1", "yes" ):
                         options[ 'default' ] = True
 
                     else:
                         options[ 'default' ] = False
 
                 else:
-                    options['default'] = '"{0}"'.format( value )
+                    options['default'] = pythonString( value )
 
             elif attr.startswith( 'NULL' ):
                 options[ 'nullable' ] = True
 
+            elif attr == 'INDEX':
+                options[ 'index' ] = True
+
             else:
                 logger.error( 'Extra unknown attributes found: {0}'.format( attr ) )
 
@@ -466,23 +549,26 @@ class TemplateColumn( TemplateBase ):
                     result += ', API.db.ForeignKey( "{0}" )'.format( attr.split( ' ' )[ 2 ] )
 
             elif attr.startswith( 'DEFAULT' ):
-                value = attr.split( ' ' )[ 1 ]
+                value = defaultValue( attr )
                 if self.isNumericField():
                     result += ', default = {0}'.format( value )
 
                 elif self.isBooleanField():
-                    if value.lower() == ( "true", "1", "yes" ):
+                    if value.lower() in ( "true", "1", "yes" ):
                         result += ', default = True'
 
                     else:
                         result += ', default = False'
 
                 else:
-                    result += ', default = "{0}"'.format( value )
+                    result += ', default = {0}'.format( pythonString( value ) )
 
             elif attr.startswith( 'NULL' ):
                 result += ', nullable = True'
 
+            elif attr == 'INDEX':
+                result += ', index = True'
+
             else:
                 logger.error( 'Extra unknown attributes found: {0}'.format( attr ) )
 
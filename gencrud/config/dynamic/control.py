@@ -16,8 +16,8 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
-from mako.template import Template
 from gencrud.config.dynamic.property import ControlProperty
+from gencrud.util.templates import getTemplateFromText
 
 
 class TemplateDymanicControl( object ):
@@ -25,7 +25,9 @@ class TemplateDymanicControl( object ):
         self.__parent = parent
         self.__name = name
         self.__htmlTemplate = htmlTemplate
+        self.__template = getTemplateFromText( htmlTemplate )
         self.__attributes = []
+        self.__defaults = None
         for name, properties in arguments.items():
             self.__attributes.append( name )
             setattr( self, name, ControlProperty( name, **properties ) )
@@ -52,6 +54,7 @@ class TemplateDymanicControl( object ):
             else:
                 setattr( self, name, ControlProperty( name, **attributes ) )
 
+        self.__defaults = None
         return
 
     def get( self, arguments ):
@@ -64,30 +67,35 @@ class TemplateDymanicControl( object ):
 
         return
 
-    def getOptions( self, ui = None ):
-        options = []
-        for attr in self.__attributes:
-            value = None
-            if ui.isSet( attr ):
-                value = ui.get( attr )
-
-            if value is None:
+    @property
+    def defaultOptions( self ) -> list:
+        """The attributes with their default option, None when the attribute has no
+        value set. This is the same for every field, so it is only made once.
+        """
+        if self.__defaults is None:
+            self.__defaults = []
+            for attr in self.__attributes:
                 value = getattr( self, attr )
-                if not value.isSet():
-                    continue
+                option = '{}="{}"'.format( attr, value ) if value.isSet() else None
+                self.__defaults.append( ( attr, option ) )
 
-                value = str( value )
+        return self.__defaults
 
-            if value is None:
-                continue
+    def getOptions( self, ui = None ):
+        options = []
+        for attr, default in self.defaultOptions:
+            value = None if ui is None else ui.get( attr )
+            if value is not None:
+                options.append( '{}="{}"'.format( attr, value ) )
 
-            options.append( '{}="{}"'.format( attr, value ) )
+            elif default is not None:
+                options.append( default )
 
         return ' '.join( options )
 
     def build( self, field, table, obj, root ):
-        return Template( self.__htmlTemplate ).render( this = self,
-                                                       field = field,
-                                                       table = table,
-                                                       obj = obj,
-                                                       root = root )
+        return self.__template.render( this = self,
+                                       field = field,
+                                       table = table,
+                                       obj = obj,
+                                       root = root )
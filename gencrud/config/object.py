@@ -112,6 +112,10 @@ class TemplateObject( TemplateBase ):
     def title( self ) -> str:
         return self.__config.get( C_TITLE, self.__config.get( C_CLASS, '<-Unknown->' ) )
 
+    @property
+    def dictionary( self ) -> dict:
+        return self.__config
+
     @property
     def name( self ) -> str:
         return self.__config.get( C_NAME, '' )
@@ -173,6 +177,16 @@ class TemplateObject( TemplateBase ):
     def actionWidth( self ) -> str:
         return self.__config.get( C_ACTION_WIDTH, '5%' )
 
+    @property
+    def serverSide( self ) -> bool:
+        # The list view leaves the filtering, sorting and paging to the backend
+        return self.__config.get( C_OPTIONS, {} ).get( C_SERVER_SIDE, False )
+
+    @property
+    def loading( self ):
+        # The default loading strategy of the relationships of the foreign keys
+        return self.__config.get( C_OPTIONS, {} ).get( C_LOADING, None )
+
     def hasAutoUpdate( self ):
         return C_AUTO_UPDATE in self.__config
 
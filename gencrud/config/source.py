@@ -121,6 +121,11 @@ class TemplateSource( TemplateBase ):
 
         return folder
 
+    @property
+    def templateFiles( self ) -> list:
+        folder = self.templateFolder
+        return [ os.path.abspath( os.path.join( folder, t ) ) for t in os.listdir( folder ) ]
+
     @property
     def commonFolder( self ) -> str:
         folder = self.__template.get( C_COMMON, {} ).get( self.__key, None )
@@ -51,6 +51,72 @@ class RelationShip( TemplateBase ):
         return self.__relation.get( C_CASCADE )
 
 
+class TemplateIndex( TemplateBase ):
+    """A secondary index of the table from the 'indexes' section;
+
+        indexes:
+          IX_ROLE_NAME:     D_ROLE_NAME, D_ROLE_ID DESC
+          IX_ROLE_ACTIVE:
+            columns:        [ D_ROLE_NAME ]
+            unique:         true
+            where:          D_ROLE_ACTIVE = true
+
+    A column followed by DESC is indexed in descending order, 'where' makes a partial index
+    on the databases that support it (PostgreSQL and SQLite).
+    """
+    def __init__( self, parent, name, index ):
+        TemplateBase.__init__( self, parent )
+        self.__name     = name
+        self.__index    = index if isinstance( index, dict ) else { C_COLUMNS: index }
+        columns         = self.__index.get( C_COLUMNS, [] )
+        if isinstance( columns, str ):
+            columns = columns.split( ',' )
+
+        self.__columns  = []
+        for column in columns:
+            words = column.split()
+            if len( words ) not in ( 1, 2 ) or ( len( words ) == 2 and words[ 1 ].lower() not in ( C_ASCENDING, C_DESENDING ) ):
+                raise InvalidSetting( C_COLUMNS, C_INDEXES, name, '<column> [ ASC | DESC ]' )
+
+            self.__columns.append( ( words[ 0 ], len( words ) == 2 and words[ 1 ].lower() == C_DESENDING ) )
+
+        if len( self.__columns ) == 0:
+            raise MissingAttribute( C_INDEXES, C_COLUMNS )
+
+        return
+
+    @property
+    def name( self ) -> str:
+        return self.__name
+
+    @property
+    def columns( self ) -> list:
+        """The list of ( column name, descending ) of the index."""
+        return self.__columns
+
+    @property
+    def unique( self ) -> bool:
+        return self.__index.get( C_UNIQUE, False ) is True
+
+    @property
+    def where( self ):
+        return self.__index.get( C_WHERE )
+
+    def sqlAlchemyDef( self, cls ) -> str:
+        result = 'API.db.Index( {!r}'.format( self.__name )
+        for column, descending in self.__columns:
+            result += ', {}.{}{}'.format( cls, column, '.desc()' if descending else '' )
+
+        if self.unique:
+            result += ', unique = True'
+
+        if self.where is not None:
+            result += ', postgresql_where = API.db.text( {0!r} ), sqlite_where = API.db.text( {0!r} )'.format( self.where )
+
+        result += ' )'
+        return result
+
+
 class TemplateTable( TemplateBase ):
     def __init__( self, parent, **table ):
         TemplateBase.__init__( self, parent )
@@ -61,6 +127,7 @@ class TemplateTable( TemplateBase ):
         self.__viewSize         = None
         self.__defaultViewSize  = 10
         self.__inports          = SourceImport()
+        self.__indexes          = []
         if C_NAME not in self.__table:
             raise MissingAttribute( C_TABLE, C_NAME )
 
@@ -83,6 +150,47 @@ class TemplateTable( TemplateBase ):
             else:
                 raise InvalidViewSize()
 
+        names = [ column.name for column in self.__columns ]
+        for name, index in self.__table.get( C_INDEXES, {} ).items():
+            index = TemplateIndex( self, name, index )
+            for column, _ in index.columns:
+                if column not in names:
+                    raise InvalidSetting( C_COLUMNS, C_INDEXES, name, names )
+
+            self.__indexes.append( index )
+
+        self.checkIndexes()
+        return
+
+    def checkIndexes( self ):
+        """Warns for the sort and foreign key columns that are not the first column of an index."""
+        indexed = set()
+        for column in self.__columns:
+            if column.isPrimaryKey() or column.hasIndex() or column.hasUniqueKey():
+                indexed.add( column.name )
+
+        uniqueKey = self.__table.get( C_UNIQUE_KEY )
+        if isinstance( uniqueKey, dict ):
+            for fields in uniqueKey.values():
+                fields = fields.split( ',' ) if isinstance( fields, str ) else fields
+                if len( fields ) > 0:
+                    indexed.add( fields[ 0 ].strip() )
+
+        for index in self.__indexes:
+            indexed.add( index.columns[ 0 ][ 0 ] )
+
+        for column in self.__columns:
+            if column.name in indexed:
+                continue
+
+            if column.hasForeignKey():
+                logger.warning( "Foreign key column {}.{} has no index, add INDEX to the field or "
+                                "an entry in 'indexes'".format( self.name, column.name ) )
+
+            elif column.listview.sort or ( self.__viewSort is not None and self.__viewSort.field == column.name ):
+                logger.warning( "Sort column {}.{} has no index, add INDEX to the field or "
+                                "an entry in 'indexes'".format( self.name, column.name ) )
+
         return
 
     @property
@@ -190,6 +298,15 @@ class TemplateTable( TemplateBase ):
     def columns( self ):
         return self.__columns
 
+    @property
+    def indexes( self ) -> list:
+        return self.__indexes
+
+    @property
+    def eagerLoading( self ) -> list:
+        # The columns of which the relationship is loaded together with the records
+        return [ field for field in self.__columns if field.loading is not None ]
+
     @property
     def primaryKey( self ) -> str:
         return self.__primaryKey
@@ -207,6 +324,15 @@ class TemplateTable( TemplateBase ):
         return sorted( [ col for col in self.__columns if col.listview.index is not None ],
                        key = lambda col: col.listview.index )
 
+    @property
+    def listColumns( self ) -> list:
+        # The columns loaded for the list view; the primary key and the list view columns
+        if len( self.listViewColumns ) == 0:
+            return []
+
+        return [ col for col in self.__columns if col.name == self.__primaryKey ] + \
+               [ col for col in self.listViewColumns if col.name != self.__primaryKey ]
+
     def buildFilter( self ) -> str:
         result = [ ]
         for item in self.listViewColumns:
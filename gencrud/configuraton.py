@@ -20,6 +20,7 @@ from typing import TypeVar, Iterable
 from ruamel import yaml
 import os
 import io
+import copy
 import gencrud.util.utils
 from gencrud.config.object import TemplateObject, TemplateObjects
 from gencrud.config.source import TemplateSourcePython, TemplateSourceAngular
@@ -27,13 +28,26 @@ from gencrud.config.options import TemplateOptions
 from gencrud.config.references import TemplateReferences
 from gencrud.config.dynamic.controls import DymanicControls
 from gencrud.constants import *
-from gencrud.util.exceptions import MissingAttribute
+from gencrud.util.exceptions import MissingAttribute, IncludeCycle
 import jsonschema
 from gencrud.schema import GENCRUD_SCHEME
 
 
 OptionalString = TypeVar( 'OptionalString', str, None )
 
+# The schema validator is build once per process
+_validator = None
+
+
+def schemaValidator() -> jsonschema.Draft7Validator:
+    global _validator
+    if _validator is None:
+        jsonschema.Draft7Validator.check_schema( GENCRUD_SCHEME )
+        _validator = jsonschema.Draft7Validator( GENCRUD_SCHEME )
+
+    return _validator
+
+
 def my_compose_document(self):
     self.get_event()
     node = self.compose_node(None, None)
@@ -45,6 +59,32 @@ def my_compose_document(self):
 yaml.SafeLoader.compose_document = my_compose_document
 
 
+class IncludeAnchors( dict ):
+    """The anchors for an included file, these are shared with the including file.
+    Records whether the included file uses an anchor of the including file.
+    """
+    def __init__( self, master ):
+        dict.__init__( self, master )
+        self.__master   = master
+        self.used       = False
+        return
+
+    def __getitem__( self, key ):
+        value = dict.__getitem__( self, key )
+        if key in self.__master and dict.get( self.__master, key ) is value:
+            self.used = True
+            # This lets the include of the including file record the use as well
+            return self.__master[ key ]
+
+        return value
+
+
+# The parsed include files, by filename: ( dependencies, data, anchors )
+_includes       = {}
+# The include files being parsed, with their dependencies; the filenames and modification times
+_including      = []
+
+
 def yaml_include( loader, node ):
     if node.value.startswith( '.' ):
         include_name = os.path.join( os.path.dirname( node.start_mark.name ), node.value )
@@ -53,17 +93,50 @@ def yaml_include( loader, node ):
         include_name = node.value
 
     include_name = os.path.abspath( include_name )
-    with open( include_name, 'r' ) as inputfile:
-        data = my_safe_load( inputfile, master = loader )
-        return data
+    if include_name in [ filename for filename, _ in _including ]:
+        raise IncludeCycle( [ filename for filename, _ in _including ] + [ include_name ] )
+
+    entry = _includes.get( include_name )
+    if entry is not None and all( os.path.getmtime( filename ) == mtime for filename, mtime in entry[ 0 ] ):
+        dependencies, data, defined = entry
+        if len( _including ) > 0:
+            _including[ -1 ][ 1 ].extend( dependencies )
+
+        loader.anchors.update( defined )
+        return copy.deepcopy( data )
+
+    dependencies = [ ( include_name, os.path.getmtime( include_name ) ) ]
+    _including.append( ( include_name, dependencies ) )
+    try:
+        anchors = IncludeAnchors( loader.anchors )
+        with open( include_name, 'r' ) as inputfile:
+            data = my_safe_load( inputfile, anchors = anchors )
+
+    finally:
+        _including.pop()
+
+    if len( _including ) > 0:
+        _including[ -1 ][ 1 ].extend( dependencies )
+
+    # The anchors defined by the included file are available to the including file
+    defined = { key: value for key, value in anchors.items() if dict.get( loader.anchors, key ) is not value }
+    loader.anchors.update( defined )
+    if not anchors.used:
+        # The result does not depend on the including file, so it can be reused
+        _includes[ include_name ] = ( dependencies, copy.deepcopy( data ), defined )
+
+    return data
 
 
 yaml.add_constructor( "!include", yaml_include, Loader=yaml.SafeLoader )
 
 
-def my_safe_load(stream, Loader=yaml.SafeLoader, master=None):
+def my_safe_load(stream, Loader=yaml.SafeLoader, master=None, anchors=None):
     loader = Loader(stream)
-    if master is not None:
+    if anchors is not None:
+        loader.anchors = anchors
+
+    elif master is not None:
         loader.anchors = master.anchors
 
     try:
@@ -111,15 +184,19 @@ class TemplateConfiguration( object ):
 
         # Veryfy the loaded template against the schema
         try:
-            jsonschema.Draft7Validator(GENCRUD_SCHEME)
-            jsonschema.validate(instance=self.__config, schema=GENCRUD_SCHEME)
+            errors = list( schemaValidator().iter_errors( self.__config ) )
 
         except jsonschema.SchemaError as exc:
             print(exc)
             raise SystemExit
 
-        except jsonschema.ValidationError as exc:
-            print(exc)
+        if len( errors ) > 0:
+            # Report all the errors at once
+            print( "Template has {} error(s):".format( len( errors ) ) )
+            for error in errors:
+                print( "  {}: {}".format( '/'.join( str( item ) for item in error.absolute_path ) or '<root>',
+                                          error.message ) )
+
             raise SystemExit
 
         self.__controls     = None
@@ -181,4 +258,8 @@ class TemplateConfiguration( object ):
 
     @property
     def version( self ):
-        return self.__config.get( C_VERSION, C_VERSION_DEFAULT )
\ No newline at end of file
+        return self.__config.get( C_VERSION, C_VERSION_DEFAULT )
+
+    @property
+    def dictionary( self ) -> dict:
+        return self.__config
\ No newline at end of file
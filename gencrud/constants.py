@@ -37,6 +37,8 @@ C_BACKUP                = 'backup'
 C_IGNORE_CASE_DB_IDS    = 'ignore-case-db-ids'
 C_OVERWRITE             = 'overwrite'
 C_LAZY_LOADING          = 'lazy-loading'
+C_SERVER_SIDE           = 'server-side'
+C_LOADING               = 'loading'
 C_SORT                  = 'sort'
 
 C_APP_MODULE            = 'app-module'
@@ -149,6 +151,7 @@ C_VIEW_SORT             = 'viewSort'
 C_VIEW_SIZE             = 'viewSize'
 C_UNIQUE_KEY            = 'unique-key'
 C_UNIQUE                = 'unique'
+C_INDEXES               = 'indexes'
 
 C_ASCENDING             = 'asc'
 C_DESENDING             = 'desc'
@@ -234,3 +237,6 @@ C_GENERATE_BACKEND      = 'generate-backend'
 
 C_GENCRUD_TEMPLATES     = 'GENCRUD_TEMPLATES'
 C_GENCRUD               = 'GENCRUD'
+
+C_MANIFEST_FILE         = '.gencrud-manifest.json'
+C_COMMON_MANIFEST_FILE  = '.gencrud-common.json'
@@ -29,6 +29,7 @@ import gencrud.util.utils
 from gencrud.configuraton import TemplateConfiguration, my_safe_load
 from gencrud.generators.python import generatePython
 from gencrud.generators.angular import generateAngular
+from gencrud.generators.parallel import generateParallel
 from gencrud.version import __version__, __author__, __email__, __copyright__
 from gencrud.util.exceptions import ( InvalidEnvironment,
                                       EnvironmentInvalidMissing,
@@ -108,13 +109,13 @@ def verifyLoadProject( config: TemplateConfiguration, env ):
     return data
 
 
-def initializeCodeGenerationProcess( input_file ):
+def loadConfiguration( input_file ):
     with open( input_file, 'r' ) as stream:
         config = TemplateConfiguration( stream )
 
     if config.nogen:
         print( "This template is blocked for generation" )
-        return
+        return None
 
     if C_VERSION in config:
         gencrud.util.utils.version = config.version
@@ -133,17 +134,22 @@ def initializeCodeGenerationProcess( input_file ):
     else:
         logger.info( "NOT generating backend code" )
 
+    return config
+
+
+def initializeCodeGenerationProcess( input_file ):
+    config = loadConfiguration( input_file )
+    if config is None:
+        return
+
     if config.options.generateBackend:
         logger.info( "*** Generating Python backend source code.***" )
-        generatePython( config,
-                        [ os.path.abspath( os.path.join( config.python.templateFolder, t ) )
-                                   for t in os.listdir( config.python.templateFolder ) ] )
+        generatePython( config, config.python.templateFiles )
 
     if config.options.generateFrontend:
         logger.info( "*** Generating Typescript Angular frontend source code. ***" )
-        generateAngular( config,
-                         [ os.path.abspath( os.path.join( config.angular.templateFolder, t ) )
-                                        for t in os.listdir( config.angular.templateFolder ) ] )
+        generateAngular( config, config.angular.templateFiles )
+
     return
 
 
@@ -176,8 +182,16 @@ Options:
     -c / --ignore-case-db-ids           All database names shall be in lower case. 
     -M / --module                       Create module component for template and use GenCrudModule.
                                         instead of adding the components directly into app.module.ts   
-    -s / --ssl-verify                    Disable the verification of ssl certificate when    
-                                        retrieving some external profile data.
+    -s / --ssl-verify                   Obsolete, no external data is retrieved anymore.
+    --template-cache <folder>           Folder where the compiled templates are stored between runs
+                                        (default ~/.gencrud/cache).
+    --no-template-cache                 Do not store the compiled templates between runs.
+    --incremental                       Only generate the objects of which the template, the object
+                                        definition or the gencrud version changed since the last run.
+    --link-common                       Hard link the common Angular files into the project instead
+                                        of copying them.
+    -j / --jobs <count>                 Generate the objects with <count> worker processes, 0 uses
+                                        one process per CPU (default 1, no worker processes).
     -v                                  Verbose option, prints what the tool is doing.
     -V / --version                      Print the version of the tool.
 ''' )
@@ -189,16 +203,21 @@ def main():
     logging.basicConfig( format = FORMAT, level=logging.WARNING, stream = sys.stdout )
     try:
         opts, args = getopt.getopt( sys.argv[1:],
-                                    'hs:obvVcMri:e:', [ 'help',
+                                    'hs:obvVcMri:e:j:', [ 'help',
                                                         'ssl-verify=',
                                                         'overwrite',
                                                         'backup',
                                                         'module',
                                                         'recursive',
                                                         'ignore=',
-                                                        'extension='
+                                                        'extension=',
                                                         'version',
-                                                        'ignore-case-db-ids' ] )
+                                                        'ignore-case-db-ids',
+                                                        'template-cache=',
+                                                        'no-template-cache',
+                                                        'jobs=',
+                                                        'incremental',
+                                                        'link-common' ] )
 
     except getopt.GetoptError as err:
         # print help information and exit:
@@ -208,6 +227,7 @@ def main():
     ignoreFolders = [ ]
     recursive = False
     extension   = '.yaml'
+    jobs        = 1
     try:
         for o, a in opts:
             if o == '-v':
@@ -249,15 +269,45 @@ def main():
             elif o.lower() in ( '-s', '--ssl-verify' ):
                 gencrud.util.utils.sslVerify = a.lower() == 'true'
 
+            elif o == '--template-cache':
+                gencrud.util.utils.templateCache = os.path.abspath( os.path.expanduser( a ) )
+
+            elif o == '--no-template-cache':
+                gencrud.util.utils.templateCache = None
+
+            elif o == '--incremental':
+                gencrud.util.utils.incremental = True
+
+            elif o == '--link-common':
+                gencrud.util.utils.linkCommon = True
+
+            elif o in ( '-j', '--jobs' ):
+                jobs = int( a )
+                if jobs <= 0:
+                    jobs = os.cpu_count() or 1
+
             else:
                 assert False, 'unhandled option'
 
-        gencrud.util.utils.check_nltk()
         if len( args ) == 0:
             usage( 'Missing input file(s)' )
             sys.exit( 1 )
 
         banner()
+        configurations = []
+
+        def processInputFile( filename ):
+            if jobs == 1:
+                initializeCodeGenerationProcess( filename )
+                return
+
+            # Only load and verify here, the generation is done when all input files are known
+            config = loadConfiguration( filename )
+            if config is not None:
+                configurations.append( ( filename, config ) )
+
+            return
+
         if recursive:
             def doRecursiveFolders( path, extension, ignore_folders ):
                 with os.scandir(path) as it:
@@ -286,7 +336,7 @@ def main():
 
                         filename = os.path.join( path, entry.name )
                         print( f"Filename: {filename} from wildcard" )
-                        initializeCodeGenerationProcess( filename )
+                        processInputFile( filename )
 
             for arg in args:
                 doRecursiveFolders( os.path.abspath( os.path.expanduser( arg ) ), extension, ignoreFolders )
@@ -299,11 +349,14 @@ def main():
                         print( f"Filename: {filename} from wildcard" )
                         if filename.lower().endswith( extension ):
                             # process the configuration file and create code files
-                            initializeCodeGenerationProcess( filename )
+                            processInputFile( filename )
 
                 else:
                     print( "Filename: {}".format( arg ) )
-                    initializeCodeGenerationProcess( arg )
+                    processInputFile( arg )
+
+        if len( configurations ) > 0:
+            generateParallel( configurations, jobs )
 
         print( "Done" )
 
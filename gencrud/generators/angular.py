@@ -22,17 +22,18 @@ import shutil
 import logging
 import datetime
 import gencrud.version
-from mako.template import Template
 from mako import exceptions
 import gencrud.util.utils
 import gencrud.util.exceptions
+from gencrud.util.templates import getTemplate
+from gencrud.util.manifest import Manifest, FileDigests
+from gencrud.util.output import writeFile, renderedText
 from gencrud.constants import *
 from gencrud.configuraton import TemplateConfiguration
-from gencrud.util.typescript import TypeScript
+from gencrud.util.typescript import TypeScript, TsArray, TsArrayEditor, applyEdits
 from gencrud.util.positon import PositionInterface
-from gencrud.util.sha import sha256sum
+from gencrud.util.patch import DocumentPatch
 import posixpath
-import time
 
 logger = logging.getLogger()
 
@@ -42,13 +43,14 @@ NG_ENTRY_COMPONENTS = 'entryComponents'
 NG_IMPORTS          = 'imports'
 NG_PROVIDERS        = 'providers'
 NG_DECLARATIONS     = 'declarations'
+APP_MODULE_JSON     = 'app.module.json'
 
 
 def makeAngularModule( root_path, *args ):
     if len( args ) > 0:
         modulePath = os.path.join( root_path, args[ 0 ] )
         if not os.path.isdir( modulePath ):
-            os.mkdir( modulePath )
+            os.makedirs( modulePath, exist_ok = True )
 
         makeAngularModule( modulePath, *args[ 1: ] )
 
@@ -56,33 +58,10 @@ def makeAngularModule( root_path, *args ):
 
 
 def updateImportSection( lines, files ):
-    rangePos = PositionInterface()
-    stage = 0
-    for lineNo, lineText in enumerate( lines ):
-        lineText = lineText.strip( ' \n' )
-        if stage == 0 and lineText.startswith( 'import' ):
-            if lineText.endswith( ';' ):
-                rangePos.end = lineNo
-
-            else:
-                stage = 1
-
-        elif stage == 1:
-            if lineText.endswith( ';' ):
-                stage = 0
-                rangePos.end = lineNo
-
-    rangePos.end += 1
-    for imp in files:
-        foundLine = False
-        for lineNo in rangePos.range():
-            if imp in lines[ lineNo ]:
-                foundLine = True
-                break
-
-        if not foundLine:
-            lines.insert( rangePos.end, imp + '\n' )
-            rangePos.end += 1
+    patch = DocumentPatch( lines )
+    patch.addImports( files )
+    patch.apply()
+    return
 
 
 def updateAngularAppModuleTs( config: TemplateConfiguration, app_module, exportsModules ):
@@ -98,49 +77,55 @@ def updateAngularAppModuleTs( config: TemplateConfiguration, app_module, exports
                              config.references.app_module.filename ), 'r' ) as stream:
         lines = stream.readlines()
 
-    if config.options.backupFiles:
-        gencrud.util.utils.backupFile( os.path.join( config.angular.sourceFolder,
-                                                     config.references.app_module.filename ) )
-
     rangePos        = PositionInterface()
     sectionLines    = gencrud.util.utils.searchSection( lines,
                                                         rangePos,
                                                         LABEL_NG_MODULE + '{',
                                                       '})' )
-    pos = sectionLines[ 0 ].find( '{' )
-    sectionLines[ 0 ] = sectionLines[ 0 ][ pos: ]
-    pos = sectionLines[ -1 ].find( '}' )
-    sectionLines[ -1 ] = sectionLines[ -1 ][ : pos + 1 ]
-
-    ts = TypeScript()
-    NgModule = ts.parse( ''.join( sectionLines ) )
+    # Only the new entries are inserted into the source text of the @NgModule, the rest of
+    # the text, with its comments and layout, stays as it is
+    sectionText = ''.join( sectionLines )
+    pos = sectionText.find( '{' )
+    NgModule = TypeScript().parseTree( sectionText[ pos: ] )
+    edits = []
 
     def updateNgModule( section ):
+        node = NgModule.get( section )
+        if not isinstance( node, TsArray ):
+            logger.warning( "No '{}' array in the @NgModule of {}".format( section,
+                                                                         config.references.app_module.filename ) )
+            return
+
         injectPoint = -1
         for idx, decl in enumerate( app_module[ section ] ):
             if config.references.app_routing.module in decl:
                 injectPoint = idx
 
+        editor = TsArrayEditor( node )
         for decl in app_module[ section ]:
-            if decl != '' and decl not in NgModule[ section ]:
-                NgModule[ section ].insert( injectPoint, decl )
+            if decl != '' and decl not in editor.values():
+                editor.insert( injectPoint, decl )
+
+        edits.extend( editor.edits() )
 
     updateNgModule( NG_DECLARATIONS )
     updateNgModule( NG_PROVIDERS )
     updateNgModule( NG_IMPORTS )
     updateNgModule( NG_ENTRY_COMPONENTS )
 
-    buffer = LABEL_NG_MODULE + ts.build( NgModule, 2 ) + ')'
-    bufferLines = [ '{}\n'.format( x ) for x in buffer.split( '\n' ) ]
-    gencrud.util.utils.replaceInList( lines, rangePos, bufferLines )
+    patch = DocumentPatch( lines )
+    if len( edits ) > 0:
+        sectionText = sectionText[ :pos ] + applyEdits( sectionText[ pos: ], edits )
+        patch.replace( rangePos.start, rangePos.end, sectionText.splitlines( True ) )
 
-    updateImportSection( lines, app_module[ 'files' ] )
-    with open( os.path.join( config.angular.sourceFolder,
-                             config.references.app_module.filename ), 'w' ) as stream:
-        for line in lines:
-            stream.write( line )
-            logger.debug( line.replace( '\n', '' ) )
+    patch.addImports( app_module[ 'files' ] )
+    patch.apply()
+    for line in lines:
+        logger.debug( line.replace( '\n', '' ) )
 
+    writeFile( os.path.join( config.angular.sourceFolder, config.references.app_module.filename ),
+               ''.join( lines ),
+               config.options.backupFiles )
     return
 
 
@@ -157,10 +142,6 @@ def updateAngularAppRoutingModuleTs( config: TemplateConfiguration, app_module )
                              config.references.app_routing.module ), 'r' ) as stream:
         lines = stream.readlines()
 
-    if config.options.backupFiles:
-        gencrud.util.utils.backupFile( os.path.join( config.angular.sourceFolder,
-                                                     config.references.app_routing.module ) )
-
     imports = []
     entries = []
     for cfg in config:
@@ -264,46 +245,47 @@ def updateAngularAppRoutingModuleTs( config: TemplateConfiguration, app_module )
                                                      rangePos,
                                                      LABEL_APP_ROUTES,
                                                    ']' )
-    pos = sectionLines[ 0 ].find( '[' )
-    sectionLines[ 0 ] = sectionLines[ 0 ][ pos: ]
-    pos = sectionLines[ -1 ].find( ']' )
-    sectionLines[ -1 ] = sectionLines[ -1 ][ : pos + 1 ]
-
+    # Only the new and changed routes are written into the source text of the routes, the
+    # rest of the text, with its comments and layout, stays as it is
+    sectionText = ''.join( sectionLines )
+    pos = sectionText.find( '[' )
     ts = TypeScript()
-    appRoutes = ts.parse( ''.join( sectionLines ) )
+    appRoutes = TsArrayEditor( ts.parseTree( sectionText[ pos: ] ) )
     for entry in entries:
         logger.debug( "Route: {}".format( json.dumps( entry ) ) )
 
         routeIdx = -1
-        for idx, route in enumerate( appRoutes ):
+        for idx, route in enumerate( appRoutes.values() ):
             if route == entry:
                 logger.error( "Found route: {}".format( route ) )
-                logger.error( json.dumps( appRoutes ) )
                 routeIdx = idx
                 break
 
-            if route[ C_PATH ] == entry:
+            if isinstance( route, dict ) and route.get( C_PATH ) == entry:
                 logger.info( "Found route: {}".format( route[ C_PATH ] ) )
-                logger.info( json.dumps( appRoutes ) )
                 routeIdx = idx
                 break
 
         if routeIdx == -1:
-            appRoutes.insert( -1, entry )
+            appRoutes.insert( -1, ts.build( entry, 2 ) if isinstance( entry, dict ) else entry )
 
-        else:
-            appRoutes[ routeIdx ] = entry
+        elif appRoutes.values()[ routeIdx ] != entry:
+            appRoutes.replace( routeIdx, ts.build( entry, 2 ) if isinstance( entry, dict ) else entry )
 
-    buffer = LABEL_APP_ROUTES + ' ' + ts.build( appRoutes, 2 ) + ';'
-    bufferLines = [ '{}\n'.format( x ) for x in buffer.split( '\n' ) ]
-    gencrud.util.utils.replaceInList( lines, rangePos, bufferLines )
+    patch = DocumentPatch( lines )
+    edits = appRoutes.edits()
+    if len( edits ) > 0:
+        sectionText = sectionText[ :pos ] + applyEdits( sectionText[ pos: ], edits )
+        patch.replace( rangePos.start, rangePos.end, sectionText.splitlines( True ) )
 
-    updateImportSection( lines, imports )
-    with open( os.path.join( config.angular.sourceFolder, config.references.app_routing.module ), 'w' ) as stream:
-        for line in lines:
-            stream.write( line )
-            logger.debug( line.replace( '\n', '' ) )
+    patch.addImports( imports )
+    patch.apply()
+    for line in lines:
+        logger.debug( line.replace( '\n', '' ) )
 
+    writeFile( os.path.join( config.angular.sourceFolder, config.references.app_routing.module ),
+               ''.join( lines ),
+               config.options.backupFiles )
     return imports
 
 
@@ -311,6 +293,36 @@ def exportAndType( line ):
     return line.split( ' ' )[ 1: 3 ]
 
 class ComponentsModules( list ):
+    def __init__( self, *args ):
+        list.__init__( self, *args )
+        # The app.module.json data of the objects, by ( application, name ), in the order of generation
+        self.appModules = {}
+        return
+
+    def addAppModule( self, app, name, data: dict ):
+        self.appModules[ ( app, name ) ] = data
+        return
+
+    def merge( self, other ):
+        for item in other:
+            self.append( item )
+
+        self.appModules.update( other.appModules )
+        return
+
+    def appModule( self ) -> dict:
+        """Returns the app.module.json data of all objects, each entry of a section only once.
+        The last generated object comes first, as the project files were always updated in that order.
+        """
+        sections = {}
+        for data in reversed( list( self.appModules.values() ) ):
+            for key, values in data.items():
+                section = sections.setdefault( key, {} )
+                for value in values:
+                    section[ value ] = None
+
+        return { key: list( section ) for key, section in sections.items() }
+
     def append( self, new_item ):
         for app, name, source, exportType in list( self ):
             logger.info( "Component {} - {} - {} - {}".format( app, name, source, exportType ) )
@@ -370,19 +382,30 @@ class ServicesList( list ):
         return (FILLER if len(result) > 0 else '') + (FILLER_LF.join(result))
 
 
-def generateAngular( config: TemplateConfiguration, templates: list ):
-    modules = ComponentsModules()
+def generateAngularObjects( config: TemplateConfiguration, templates: list, modules: ComponentsModules, indexes = None ) -> Manifest:
+    """Generates the frontend components for the objects at 'indexes' in the configuration,
+    or for all objects when 'indexes' is None. The exported components and the app.module.json
+    data are added to 'modules', the shared project files are updated by updateAngularProject().
+
+    :returns:   the manifest of the source folder, with the objects that were generated.
+    """
+    manifest = Manifest( config.angular.sourceFolder )
     if not os.path.isdir( config.angular.sourceFolder ):
-        os.makedirs( config.angular.sourceFolder )
+        os.makedirs( config.angular.sourceFolder, exist_ok = True )
 
     dt = datetime.datetime.now()
     generationDateTime = dt.strftime( "%Y-%m-%d %H:%M:%S" )
     userName = os.path.split( os.path.expanduser( "~" ) )[ 1 ]
-    for cfg in config:
+    for idx, cfg in enumerate( config ):
+        if indexes is not None and idx not in indexes:
+            continue
+
         modulePath = os.path.join( config.angular.sourceFolder,
                                    config.application,
                                    cfg.name )
-        if os.path.isdir( modulePath ) and not config.options.overWriteFiles:
+        fingerprint = Manifest.fingerprint( config, cfg, templates )
+        unchanged = gencrud.util.utils.incremental and manifest.unchanged( Manifest.key( config, cfg ), fingerprint )
+        if os.path.isdir( modulePath ) and not config.options.overWriteFiles and not unchanged:
             raise gencrud.util.exceptions.ModuleExistsAlready( cfg, modulePath )
 
         makeAngularModule( config.angular.sourceFolder,
@@ -398,6 +421,14 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
         logger.info( 'primary key : {0}'.format( cfg.table.primaryKey ) )
         logger.info( 'uri         : {0}'.format( cfg.uri ) )
 
+        if unchanged:
+            # The app.module.json is not stored, so only that one is generated again.
+            logger.info( 'unchanged   : {0}'.format( cfg.name ) )
+            for item in manifest.exports( Manifest.key( config, cfg ) ):
+                modules.append( item )
+
+        files = []
+        exports = []
         servicesList = ServicesList()
         for field in cfg.table.columns:
             if field.ui is not None and field.ui.isUiType(C_CHOICE, C_CHOICE_AUTO, C_COMBOBOX, C_COMBO, C_CHECKBOX) and field.hasService():
@@ -412,17 +443,14 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
             if cfg.ignoreTemplates( templ ):
                 continue
 
-            if not config.options.overWriteFiles and os.path.isfile( templateFilename ):
+            if unchanged and gencrud.util.utils.sourceName( templ ) != APP_MODULE_JSON:
                 continue
 
-            logger.info( 'template    : {0}'.format( templ ) )
-            if config.options.backupFiles:
-                gencrud.util.utils.backupFile( templateFilename )
-
-            if os.path.isfile( templateFilename ):
-                # First remove the old file
-                os.remove( templateFilename )
+            if not config.options.overWriteFiles and os.path.isfile( templateFilename ) and \
+                    gencrud.util.utils.sourceName( templ ) != APP_MODULE_JSON:
+                continue
 
+            logger.info( 'template    : {0}'.format( templ ) )
             logger.info( 'template    : {0}'.format( templ ) )
             if C_SCREEN in templ:
                 logger.debug( 'Action new  : {0}'.format( cfg.actions.get( C_NEW ).type ) )
@@ -450,76 +478,62 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
             else:
                 pass
 
-            with open( templateFilename, gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                try:
-                    for line in Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
-                                                                                        root = config,
-                                                                                        version = gencrud.version.__version__,
-                                                                                        username = userName,
-                                                                                        services = servicesList,
-                                                                                        date = generationDateTime ).split( '\n' ):
-
-                        if line.startswith( 'export ' ):
-                            modules.append( ( config.application,
-                                              cfg.name,
-                                              gencrud.util.utils.sourceName( templ ),
-                                              exportAndType( line ) ) )
-
-                        stream.write( line )
-                        if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX:
-                            stream.write( '\n' )
-
-                except Exception:
-                    logger.error( "Mako exception:" )
-                    for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
-                        logger.error( line )
-
-                    logger.error( "Mako done" )
-                    raise
+            if gencrud.util.utils.sourceName( templ ) != APP_MODULE_JSON:
+                files.append( templateFilename )
 
-    appModule = {}
-    exportsModules = []
-    for app, mod, source, export in modules:
-        # Update 'app.module.json'
-        app_module_json_file = os.path.join( config.angular.sourceFolder,
-                                             app,
-                                             mod,
-                                             'app.module.json' )
-        if os.path.isfile( app_module_json_file ):
-            with open( app_module_json_file, 'r' ) as stream:
+            try:
+                text = getTemplate( templ ).render( obj = cfg,
+                                                    root = config,
+                                                    version = gencrud.version.__version__,
+                                                    username = userName,
+                                                    services = servicesList,
+                                                    date = generationDateTime )
+
+            except Exception:
+                logger.error( "Mako exception:" )
+                for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
+                    logger.error( line )
+
+                logger.error( "Mako done" )
+                raise
+
+            if gencrud.util.utils.sourceName( templ ) == APP_MODULE_JSON:
+                # The contribution to app.module.ts is merged in memory by updateAngularProject()
                 try:
-                    data = json.load( stream )
+                    modules.addAppModule( config.application, cfg.name, json.loads( text ) )
 
-                except Exception:
-                    logger.error( "Error in file: {0}".format( app_module_json_file ) )
+                except ValueError:
+                    logger.error( "Error in {0} of {1}".format( APP_MODULE_JSON, cfg.name ) )
                     raise
 
-                if appModule is None:
-                    appModule = data
+                continue
 
-                else:
-                    appModule = gencrud.util.utils.joinJson( appModule, data )
+            for line in text.split( '\n' ):
+                if line.startswith( 'export ' ):
+                    item = ( config.application,
+                             cfg.name,
+                             gencrud.util.utils.sourceName( templ ),
+                             exportAndType( line ) )
+                    exports.append( item )
+                    modules.append( item )
 
-            # This is just to give the OS some time to actually close the file
-            time.sleep(.01)
-            os.remove( app_module_json_file )
+            writeFile( templateFilename, renderedText( text ), config.options.backupFiles )
 
+        if not unchanged:
+            manifest.update( Manifest.key( config, cfg ), fingerprint, files, exports )
+
+    return manifest
+
+
+def updateAngularProject( config: TemplateConfiguration, modules: ComponentsModules ):
+    exportsModules = []
+    for app, mod, source, export in modules:
         exportsModules.append( { 'application':   app,
                                  'modules':       mod,
                                  'source':        source,
                                  'export':        export } )
 
-    # We need to un-double the 'files' entry
-    newFiles = []
-    for entry in appModule[ 'files' ]:
-        if entry not in newFiles:
-            newFiles.append( entry )
-
-    appModule[ 'files' ] = newFiles
-    # Write update 'app.module.json'
-    with open( os.path.join( config.angular.sourceFolder, 'app.module.json' ), 'w' ) as stream:
-        json.dump( appModule, stream, indent = 4 )
-
+    appModule = modules.appModule()
     logger.info( 'exportsModules' )
     for mod in exportsModules:
         logger.info( "exportsModule: {}".format( mod ) )
@@ -536,13 +550,19 @@ def generateAngular( config: TemplateConfiguration, templates: list ):
     appModule = createAngularComponentModuleTs( config, appModule )
     logger.info( "appModule: {}".format( json.dumps( appModule, indent = 4 ) ) )
     updateAngularAppModuleTs( config, appModule, exportsModules )
-
-    os.remove( os.path.join( config.angular.sourceFolder, 'app.module.json' ) )
     copyAngularCommon( config, config.angular.commonFolder,
                        os.path.join( config.angular.sourceFolder, 'common' ) )
     return
 
 
+def generateAngular( config: TemplateConfiguration, templates: list ):
+    modules = ComponentsModules()
+    manifest = generateAngularObjects( config, templates, modules )
+    updateAngularProject( config, modules )
+    manifest.save()
+    return
+
+
 def createAngularComponentModuleTs( config: TemplateConfiguration, appModule: dict ):
     if not config.options.useModule or not config.options.overWriteFiles:
         return appModule
@@ -558,31 +578,23 @@ def createAngularComponentModuleTs( config: TemplateConfiguration, appModule: di
                                  config.application,
                                  cfg.name,
                                  'module.ts'.format( cfg.name ) )
-        if config.options.backupFiles:
-            gencrud.util.utils.backupFile( filename )
-
         # Create the 'module.ts'
-        with open( filename, 'w' ) as stream:
-            # for item in cfg.modules.items:
-            #     print( item )
+        try:
+            text = getTemplate( templ ).render( obj = cfg,
+                                                root = config,
+                                                username = userName,
+                                                date = generationDateTime,
+                                                version = gencrud.version.__version__ )
 
-            try:
-                for line in Template( filename = templ ).render( obj = cfg,
-                                                                 root = config,
-                                                                 username = userName,
-                                                                 date = generationDateTime,
-                                                                 version = gencrud.version.__version__ ).split( '\n' ):
-                    stream.write( line )
-                    if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX:
-                        stream.write( '\n' )
+        except Exception:
+            logger.error("Mako exception:")
+            for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
+                logger.error(line)
 
-            except Exception:
-                logger.error("Mako exception:")
-                for line in exceptions.text_error_template().render_unicode().encode('ascii').split(b'\n'):
-                    logger.error(line)
+            logger.error("Mako done")
+            raise
 
-                logger.error("Mako done")
-                raise
+        writeFile( filename, renderedText( text ), config.options.backupFiles )
 
         component = "import {{ {cls}Module }} from './{app}/{mod}/module';".format( cls = cfg.cls,
                                                                                     app = config.application,
@@ -637,34 +649,58 @@ def createAngularComponentModuleTs( config: TemplateConfiguration, appModule: di
 
 
 def copyAngularCommon( config, source, destination ):
-    files = os.listdir( source )
-    for filename in files:
-        if filename == 'gencrud.module.ts' and not config.options.useModule:
+    """Copies the common Angular files to the project, only the files that differ from the
+    shipped files are copied. The digests of the files are kept between the runs, so a file
+    is only read again when its size or modification time changed.
+    """
+    digests = FileDigests( os.path.join( config.angular.sourceFolder, C_COMMON_MANIFEST_FILE ) )
+    copyAngularCommonFolder( config, digests, os.path.abspath( source ), os.path.abspath( destination ) )
+    digests.save()
+    return
+
+
+def copyAngularCommonFolder( config, digests: FileDigests, source, destination ):
+    for entry in os.scandir( source ):
+        target = os.path.join( destination, entry.name )
+        if entry.is_dir():
+            copyAngularCommonFolder( config, digests, entry.path, target )
             continue
 
-        if not os.path.isfile( os.path.join( destination, filename ) ) and \
-               os.path.isfile( os.path.join( source, filename ) ):
-            logger.debug( "Copy new file {0} => {1}".format( os.path.join( source, filename ),
-                                                      os.path.join( destination, filename ) ) )
-            if not os.path.isdir( destination ):
-                os.makedirs( destination )
+        if entry.name == 'gencrud.module.ts' and not config.options.useModule:
+            continue
 
-            shutil.copy( os.path.join( source, filename ),
-                         os.path.join( destination, filename ) )
+        sourceDigest = digests.digest( entry.path, entry.stat() )
+        try:
+            targetDigest = digests.digest( target )
 
-        elif os.path.isfile( os.path.join( destination, filename ) ):
-            if sha256sum( os.path.join( destination, filename ) ) != sha256sum( os.path.join( source, filename ) ):
-                # Hash differs, therefore replace the file
-                logger.debug( "Hash differs, replace the file {0} => {1}".format( os.path.join( source, filename ),
-                                                                                  os.path.join( destination, filename ) ) )
-                shutil.copy( os.path.join( source, filename ),
-                             os.path.join( destination, filename ) )
+        except FileNotFoundError:
+            targetDigest = None
 
-            else:
-                logger.debug( "{0} is the same {1}".format( os.path.join( source, filename ),
-                                                     os.path.join( destination, filename ) ) )
+        if targetDigest == sourceDigest:
+            logger.debug( "{0} is the same {1}".format( entry.path, target ) )
+            continue
+
+        logger.debug( "Copy {0} => {1}".format( entry.path, target ) )
+        os.makedirs( destination, exist_ok = True )
+        copyCommonFile( entry.path, target )
+        digests.update( target, sourceDigest )
+
+    return
+
+
+def copyCommonFile( source, target ):
+    if gencrud.util.utils.linkCommon:
+        # The link is made under a temporary name, as an existing file cannot be replaced by a link
+        tempFilename = '{}.{}.tmp'.format( target, os.getpid() )
+        try:
+            os.link( source, tempFilename )
+            os.replace( tempFilename, target )
+            return
 
-        elif os.path.isdir( os.path.join( source, filename ) ):
-            copyAngularCommon( config, os.path.join( source, filename ), os.path.join( destination, filename ) )
+        except OSError as exc:
+            logger.debug( "Cannot link {0} => {1}, copying the file: {2}".format( source, target, exc ) )
+            if os.path.isfile( tempFilename ):
+                os.remove( tempFilename )
 
+    shutil.copy( source, target )
     return
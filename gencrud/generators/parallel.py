@@ -0,0 +1,135 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import gencrud.util.utils
+from gencrud.configuraton import TemplateConfiguration
+from gencrud.util.manifest import Manifest
+from gencrud.generators.python import generatePythonObjects, updatePythonModels, updatePythonProject
+from gencrud.generators.angular import generateAngularObjects, updateAngularProject, ComponentsModules
+
+logger = logging.getLogger()
+
+# The command line settings that need to be passed on to the worker processes
+SETTINGS = ( 'sslVerify',
+             'backupFiles',
+             'overWriteFiles',
+             'ignoreCaseDbIds',
+             'useModule',
+             'lazyLoading',
+             'templateCache',
+             'incremental',
+             'linkCommon' )
+
+# The configurations loaded by a worker process, by input filename
+_configurations = {}
+
+
+def _initializeWorker( settings: dict, level: int ):
+    # Called for every task, ProcessPoolExecutor has no initializer before Python 3.7
+    logging.basicConfig( format = '%(levelname)s %(message)s', level = level )
+    logger.setLevel( level )
+    for name, value in settings.items():
+        setattr( gencrud.util.utils, name, value )
+
+    return
+
+
+def _generateObject( input_file: str, index: int, settings: dict, level: int ) -> tuple:
+    """Generates the per-object source files for one object of an input file in a worker process.
+
+    :returns:   the exported Angular components and app.module.json data of the object and the
+                updated manifest entries of the backend and frontend, these are merged into the
+                shared project files by the main process.
+    """
+    _initializeWorker( settings, level )
+    config = _configurations.get( input_file )
+    if config is None:
+        with open( input_file, 'r' ) as stream:
+            config = TemplateConfiguration( stream )
+
+        _configurations[ input_file ] = config
+
+    # The configuration objects expect the current configuration here
+    gencrud.util.utils.config = config
+    gencrud.util.utils.version = config.version
+    modules = ComponentsModules()
+    pythonUpdated = angularUpdated = {}
+    if config.options.generateBackend:
+        pythonUpdated = generatePythonObjects( config, config.python.templateFiles,
+                                               indexes = ( index, ) ).updated
+
+    if config.options.generateFrontend:
+        angularUpdated = generateAngularObjects( config, config.angular.templateFiles, modules,
+                                                 indexes = ( index, ) ).updated
+
+    return modules, pythonUpdated, angularUpdated
+
+
+def _updateProject( config: TemplateConfiguration, results: list ):
+    """Updates the shared project files for one input file, in the same order as the sequential run."""
+    gencrud.util.utils.config = config
+    if config.options.generateBackend:
+        logger.info( "*** Updating Python backend project files. ***" )
+        updatePythonProject( config, '' )
+        manifest = Manifest( config.python.sourceFolder )
+        for _, updated, _ in results:
+            manifest.merge( updated )
+
+        manifest.save()
+
+    if config.options.generateFrontend:
+        logger.info( "*** Updating Typescript Angular frontend project files. ***" )
+        modules = ComponentsModules()
+        manifest = Manifest( config.angular.sourceFolder )
+        for exports, _, updated in results:
+            modules.merge( exports )
+            manifest.merge( updated )
+
+        updateAngularProject( config, modules )
+        manifest.save()
+
+    return
+
+
+def generateParallel( configurations: list, jobs: int ):
+    """Generates the code for a list of ( input_file, config ) tuples with a pool of 'jobs' processes.
+
+    The per-object source files are generated in the worker processes, the updates of the shared
+    project files are done in this process one input file at the time in the order of the input
+    files. As in generatePython() modules.yaml and models.py are updated before the objects are
+    generated, the other project files (menu.yaml, app.module.ts, app-routing.module.ts) after.
+    """
+    settings = { name: getattr( gencrud.util.utils, name ) for name in SETTINGS }
+    with ProcessPoolExecutor( max_workers = jobs ) as executor:
+        futures = []
+        for input_file, config in configurations:
+            if config.options.generateBackend:
+                gencrud.util.utils.config = config
+                updatePythonModels( config )
+
+            futures.append( [ executor.submit( _generateObject, input_file, index, settings, logger.level )
+                                for index in range( len( config.objects ) ) ] )
+
+        for ( input_file, config ), objectFutures in zip( configurations, futures ):
+            results = [ future.result() for future in objectFutures ]
+            logger.info( "Merging project files for {}".format( input_file ) )
+            _updateProject( config, results )
+
+    return
@@ -18,17 +18,19 @@
 #
 import json
 import os
-import sys
 import yaml
 import logging
 import shutil
 import datetime
 import hashlib
 import gencrud.version
-from mako.template import Template
 from gencrud.configuraton import TemplateConfiguration
 import gencrud.util.utils
 import gencrud.util.exceptions
+from gencrud.util.templates import getTemplate
+from gencrud.util.manifest import Manifest, FileDigests
+from gencrud.constants import *
+from gencrud.util.output import writeFile, renderedText
 from gencrud.util.positon import PositionInterface
 import gencrud.util.utils as API
 
@@ -60,7 +62,7 @@ def makePythonModules( root_path, *args ):
     if len( args ) > 0:
         root_path = os.path.join( root_path, args[ 0 ] )
         if not os.path.isdir( root_path ):
-            os.mkdir( root_path )
+            os.makedirs( root_path, exist_ok = True )
 
         makePythonModules( root_path, *args[ 1: ] )
 
@@ -71,15 +73,32 @@ def makePythonModules( root_path, *args ):
     return
 
 
+def copyPythonCommon( config: TemplateConfiguration ):
+    """Copies the common Python files to the application folder. The common files are
+    replaced when they differ from the shipped files, main.py is only copied when it does
+    not exist, as it is the part of the application that is changed by the project.
+    """
+    folder = os.path.abspath( os.path.join( config.python.sourceFolder, config.application ) )
+    digests = FileDigests( os.path.join( folder, C_COMMON_MANIFEST_FILE ) )
+    for src_filename in ( 'common.py', 'datetimes.py', 'main.py', 'sqlfilter.py' ):
+        fns = os.path.abspath( os.path.join( config.python.commonFolder, src_filename ) )
+        fnd = os.path.join( folder, src_filename )
+        sourceDigest = digests.digest( fns )
+        if os.path.isfile( fnd ) and ( src_filename == 'main.py' or digests.digest( fnd ) == sourceDigest ):
+            continue
+
+        logger.debug( "Source: {}\nTarget: {}".format( fns, fnd ) )
+        shutil.copy( fns, fnd )
+        digests.update( fnd, sourceDigest )
+
+    digests.save()
+    return
+
+
 def updatePythonProject( config: TemplateConfiguration, app_module ):   # noqa
     logger.debug( config.python.sourceFolder )
-    # Copy the following files from the common-py folder to the source folder of the project
-    for src_filename in ( 'common.py', 'main.py' ):
-        fnd = os.path.abspath( os.path.join( config.python.sourceFolder, config.application, src_filename ) )
-        if not os.path.isfile( fnd ):
-            fns = os.path.abspath( os.path.join( config.python.commonFolder, src_filename ) )
-            logger.debug( "Source: {}\nTarget: {}".format( fns, fnd ) )
-            shutil.copy( fns, fnd )
+    # Copy the common files from the common-py folder to the source folder of the project
+    copyPythonCommon( config )
 
     def makeMenuId( menu,prefix ):
         return hashlib.md5( (prefix + menu.caption).encode('ascii') ).hexdigest().upper()
@@ -161,8 +180,7 @@ def updatePythonProject( config: TemplateConfiguration, app_module ):   # noqa
 
         processMenuStructure_V2( menuItems, cfg.menu )
 
-    with open( menuFilename, 'w' )  as stream:
-        yaml.dump( menuItems, stream, default_style=False, default_flow_style=False )
+    writeFile( menuFilename, yaml.dump( menuItems, default_style=False, default_flow_style=False ) )
 
     return
 
@@ -196,95 +214,119 @@ def updatePythonModels( config:  TemplateConfiguration ):
                               'model': cfg.cls,
                               'table': cfg.table.name.lower() } )
 
-    with open( modelsFilename, 'w' ) as stream:
-        yaml.dump( modules, stream, Dumper = yaml.Dumper )
+    writeFile( modelsFilename, yaml.dump( modules, Dumper = yaml.Dumper ) )
 
     # Now generate the models.py module
     template = os.path.abspath( os.path.join( config.python.commonFolder, 'models.py.templ' ) )
     modeles_py_file = os.path.join( config.python.sourceFolder, config.application, 'models.py' )
-    with open( modeles_py_file, 'w' ) as stream:
-        stream.write( Template( filename = template ).render( config = config, modules = modules ) )
+    writeFile( modeles_py_file, getTemplate( template ).render( config = config, modules = modules ) )
 
     return
 
-def generatePython( config: TemplateConfiguration, templates: list ):
-    modules = []
+def collectConstants( cfg, constants: list ):
+    for column in cfg.table.columns:
+        if column.ui is not None:
+            if column.ui.hasResolveList():
+                constants.append( '# field {}.{} constants\n'.format( cfg.table.name, column.name ) )
+                for line in column.ui.createResolveConstants():
+                    if line not in constants:
+                        constants.append( line + '\n' )
+
+                constants.append( '\n' )
+                constants.append( "C_{}_MAPPING = {}\n".format( column.name,
+                                                                column.ui.resolveListPy ) )
+                constants.append( '\n\n' )
+
+    if len( constants ) > 0:
+        constants.insert( 0, '# Generated by gencrud\n' )
+
+    return
+
+
+def generatePythonObject( config: TemplateConfiguration, cfg, templates: list, constants: list,
+                          generationDateTime: str, userName: str, manifest: Manifest ):
+    modulePath = os.path.join( config.python.sourceFolder,
+                               config.application,
+                               cfg.name )
+    # The constants of the previous objects end up in constant.py of this object
+    fingerprint = Manifest.fingerprint( config, cfg, templates, constants )
+    if gencrud.util.utils.incremental and manifest.unchanged( Manifest.key( config, cfg ), fingerprint ):
+        logger.info( 'unchanged   : {0}'.format( cfg.name ) )
+        collectConstants( cfg, constants )
+        return
+
+    files = []
+    logger.info( 'name        : {0}'.format( cfg.name ) )
+    logger.info( 'class       : {0}'.format( cfg.cls ) )
+    logger.info( 'table       : {0}'.format( cfg.table.tableName ) )
+    logger.info( 'primary key : {0}'.format( cfg.table.primaryKey ) )
+    logger.info( 'uri         : {0}'.format( cfg.uri ) )
+    for col in cfg.table.columns:
+        logger.info( '- {0:<20}  {1}'.format( col.name, col.sqlAlchemyDef() ) )
+    for templ in templates:
+        if cfg.ignoreTemplates( templ ):
+            continue
+        logger.info( 'template    : {0}'.format( templ ) )
+        if not os.path.isdir( config.python.sourceFolder ):
+            os.makedirs( config.python.sourceFolder, exist_ok = True )
+
+        if os.path.isdir( modulePath ) and not config.options.overWriteFiles:
+            raise gencrud.util.exceptions.ModuleExistsAlready( cfg, modulePath )
+        outputSourceFile = os.path.join( modulePath, gencrud.util.utils.sourceName( templ ) )
+        makePythonModules( config.python.sourceFolder, config.application, cfg.name )
+        files.append( outputSourceFile )
+        writeFile( outputSourceFile,
+                   renderedText( getTemplate( templ ).render( obj = cfg,
+                                                              root = config,
+                                                              date = generationDateTime,
+                                                              version = gencrud.version.__version__,
+                                                              username = userName ) ),
+                   config.options.backupFiles )
+
+    # The constants accumulate over the objects of the configuration
+    collectConstants( cfg, constants )
+    if len( constants ) > 0:
+        filename = os.path.join( modulePath, 'constant.py' )
+        files.append( filename )
+        writeFile( filename, ''.join( constants ), config.options.backupFiles )
+
+    entryPointsFile = os.path.join( modulePath, 'entry_points.py' )
+    if len( cfg.actions.getCustomButtons() ) > 0 and not os.path.isfile( entryPointsFile ):
+        # use the template from 'common-py'
+        templateFolder  = config.python.commonFolder
+        templateFile    = os.path.join( templateFolder, 'entry-points.py.templ' )
+
+        writeFile( entryPointsFile, getTemplate( templateFile ).render( obj = cfg, root = config ) + '\n' )
+
+    manifest.update( Manifest.key( config, cfg ), fingerprint, files )
+    return
+
+
+def generatePythonObjects( config: TemplateConfiguration, templates: list, indexes = None ) -> Manifest:
+    """Generates the backend modules for the objects at 'indexes' in the configuration,
+    or for all objects when 'indexes' is None. This does not update the shared project files.
+
+    :returns:   the manifest of the source folder, with the objects that were generated.
+    """
+    manifest = Manifest( config.python.sourceFolder )
     constants = []
-    logger.info( 'application : {0}'.format( config.application ) )
     dt = datetime.datetime.now()
     generationDateTime = dt.strftime( "%Y-%m-%d %H:%M:%S" )
     userName = os.path.split( os.path.expanduser( "~" ) )[ 1 ]
-    updatePythonModels( config )
-    for cfg in config:
-        modulePath = os.path.join( config.python.sourceFolder,
-                                   config.application,
-                                   cfg.name )
-        logger.info( 'name        : {0}'.format( cfg.name ) )
-        logger.info( 'class       : {0}'.format( cfg.cls ) )
-        logger.info( 'table       : {0}'.format( cfg.table.tableName ) )
-        logger.info( 'primary key : {0}'.format( cfg.table.primaryKey ) )
-        logger.info( 'uri         : {0}'.format( cfg.uri ) )
-        for col in cfg.table.columns:
-            logger.info( '- {0:<20}  {1}'.format( col.name, col.sqlAlchemyDef() ) )
-        for templ in templates:
-            if cfg.ignoreTemplates( templ ):
-                continue
-            logger.info( 'template    : {0}'.format( templ ) )
-            if not os.path.isdir( config.python.sourceFolder ):
-                os.makedirs( config.python.sourceFolder )
-
-            if os.path.isdir( modulePath ) and not config.options.overWriteFiles:
-                raise gencrud.util.exceptions.ModuleExistsAlready( cfg, modulePath )
-            outputSourceFile = os.path.join( modulePath, gencrud.util.utils.sourceName( templ ) )
-            if config.options.backupFiles:
-                gencrud.util.utils.backupFile( outputSourceFile )
-            if os.path.isfile( outputSourceFile ):
-                # remove the file first
-                os.remove( outputSourceFile )
-            makePythonModules( config.python.sourceFolder, config.application, cfg.name )
-            with open( outputSourceFile,
-                       gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                for line in Template( filename = os.path.abspath( templ ) ).render( obj = cfg,
-                                                                                    root = config,
-                                                                                    date = generationDateTime,
-                                                                                    version = gencrud.version.__version__,
-                                                                                    username = userName ).split( '\n' ):
-                    stream.write( line )
-                    if sys.platform.startswith( 'linux' ):
-                        stream.write( '\n' )
-
-        for column in cfg.table.columns:
-            if column.ui is not None:
-                if column.ui.hasResolveList():
-                    constants.append( '# field {}.{} constants\n'.format( cfg.table.name, column.name ) )
-                    for line in column.ui.createResolveConstants():
-                        if line not in constants:
-                            constants.append( line + '\n' )
-
-                    constants.append( '\n' )
-                    constants.append( "C_{}_MAPPING = {}\n".format( column.name,
-                                                                    column.ui.resolveListPy ) )
-                    constants.append( '\n\n' )
-
-        if len( constants ) > 0:
-            constants.insert( 0, '# Generated by gencrud\n' )
-            filename = os.path.join( modulePath, 'constant.py' )
-            if config.options.backupFiles:
-                gencrud.util.utils.backupFile( filename )
-
-            with open( filename, 'w' ) as stream:
-                stream.writelines( constants )
-
-        entryPointsFile = os.path.join( modulePath, 'entry_points.py' )
-        if len( cfg.actions.getCustomButtons() ) > 0 and not os.path.isfile( entryPointsFile ):
-            # use the template from 'common-py'
-            templateFolder  = config.python.commonFolder
-            templateFile    = os.path.join( templateFolder, 'entry-points.py.templ' )
-
-            with open( entryPointsFile, gencrud.util.utils.C_FILEMODE_WRITE ) as stream:
-                with open( templateFile, 'r' ) as templateStream:
-                    for line in Template( templateStream ).render( obj = cfg, root = config ).split( '\n' ):
-                        stream.write( line + '\n' )
+    for idx, cfg in enumerate( config ):
+        if indexes is None or idx in indexes:
+            generatePythonObject( config, cfg, templates, constants, generationDateTime, userName, manifest )
+
+        else:
+            collectConstants( cfg, constants )
+
+    return manifest
+
 
+def generatePython( config: TemplateConfiguration, templates: list ):
+    logger.info( 'application : {0}'.format( config.application ) )
+    updatePythonModels( config )
+    manifest = generatePythonObjects( config, templates )
     updatePythonProject( config, '' )
+    manifest.save()
     return
@@ -130,6 +130,18 @@ GENCRUD_SCHEME = {
                     'action-width': {
                         'type': 'string'
                     },
+                    'options': {
+                        'type': 'object',
+                        "additionalProperties": False,
+                        'properties': {
+                            'server-side': {
+                                'type': 'boolean'
+                            },
+                            'loading': {
+                                'enum': [ 'joined', 'selectin', 'raise' ]
+                            }
+                        }
+                    },
                     'modules': {
                         'type': 'array',
                         "items": {
@@ -433,6 +445,34 @@ GENCRUD_SCHEME = {
                                 'type': 'string',
                             },
                             'unique-key': { 'type': 'string' },
+                            'indexes': {
+                                'type': 'object',
+                                'additionalProperties': {
+                                    'anyOf': [
+                                        { 'type': 'string' },
+                                        { 'type': 'array', 'items': { 'type': 'string' } },
+                                        {
+                                            'type': 'object',
+                                            'required': [ 'columns' ],
+                                            "additionalProperties": False,
+                                            'properties': {
+                                                'columns': {
+                                                    'anyOf': [
+                                                        { 'type': 'string' },
+                                                        { 'type': 'array', 'items': { 'type': 'string' } }
+                                                    ]
+                                                },
+                                                'unique': {
+                                                    'type': 'boolean'
+                                                },
+                                                'where': {
+                                                    'type': 'string'
+                                                },
+                                            }
+                                        }
+                                    ]
+                                }
+                            },
                             'viewSort': {
                                 'type': 'object',
                                 'required': [ 'field', 'direction' ],
@@ -525,6 +565,9 @@ GENCRUD_SCHEME = {
                                         'unique-key': {
                                             'type': 'string'
                                         },
+                                        'loading': {
+                                            'enum': [ 'joined', 'selectin', 'raise' ]
+                                        },
                                         'label': {
                                             'type': 'string'
                                         },
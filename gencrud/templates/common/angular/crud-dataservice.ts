@@ -18,9 +18,9 @@
 #   Boston, MA 02110-1301 USA
 #
 */
-import { BehaviorSubject, Observable, throwError } from 'rxjs';
+import { BehaviorSubject, Observable, of, throwError } from 'rxjs';
 import { HttpClient, HttpErrorResponse, HttpParams, HttpHeaders } from '@angular/common/http';
-import { tap } from 'rxjs/operators';
+import { catchError, map, tap } from 'rxjs/operators';
 
 export interface BackEndInfo
 {
@@ -35,11 +35,25 @@ export interface BackEndInfo
 export interface FilterColumn
 {
     column: string;
+    value?: any;
 }
 
 export interface BackendColumnSort
 {
     column: string;
+    direction?: string;
+}
+
+// The filter of a column with a condition of the CONDITIONS_LIST of the filter-header
+export interface FilterCondition
+{
+    condition: string;
+    value?: any;
+}
+
+export interface FilterRecord
+{
+    [ column: string ]: FilterCondition;
 }
 
 export interface FilteredListReq
@@ -48,6 +62,11 @@ export interface FilteredListReq
     pageSize: number;
     columns?: FilterColumn[];
     columnSort?: BackendColumnSort;
+    lastKey?: any;
+    count?: string;
+    search?: string;
+    filter?: FilterRecord;
+    cursor?: string;
 }
 
 export interface FilteredList<T>
@@ -55,9 +74,25 @@ export interface FilteredList<T>
     page: number;
     pageSize: number;
     recordCount: number;
+    nextCursor?: string;
+    prevCursor?: string;
     records: T;
 }
 
+export interface BulkRecordResult
+{
+    index: number;
+    ok: boolean;
+    key?: any;
+    error?: string;
+}
+
+export interface BulkResult
+{
+    ok: boolean;
+    records: BulkRecordResult[];
+}
+
 export class BackendError extends Error
 {
     public code: number;
@@ -86,11 +121,27 @@ export interface PytSelectList
 }
 
 
+interface SelectListCacheEntry
+{
+    etag: string;
+    data: PytSelectList[];
+}
+
+// The select lists by uri and parameters, they are validated with their ETag on every request
+const selectListCache = new Map<string, SelectListCacheEntry>();
+
 export class CrudDataService<T>
 {
     protected debug: boolean = false;
     protected _uri: string;
     protected _backend_filter: string = null;
+    protected _filterRecord: FilterRecord = null;
+    protected _pagedRequest: FilteredListReq = null;
+    protected _nextCursor: string = null;
+    protected _prevCursor: string = null;
+    protected _primaryKey: string = null;
+    protected _keyIndex: Map<string, number> = null;
+    protected _keyIndexData: T[] = null;
     public _pageIndex: number;
     public _pageSize: number;
     public _recordCount: number;
@@ -114,6 +165,17 @@ export class CrudDataService<T>
       return;
     }
 
+    public get primaryKey(): string
+    {
+      return this._primaryKey;
+    }
+
+    public set primaryKey( value: string )
+    {
+      this._primaryKey = value;
+      return;
+    }
+
     public get data(): T[]
     {
         return this.dataChange.value;
@@ -125,15 +187,11 @@ export class CrudDataService<T>
     }
 
     /** CRUD METHODS */
-    public getAll( _backend_filter: any ): void
+    public getAll( _backend_filter: any, filter: FilterRecord = null ): void
     {
-        let uri = '/list';
-        if ( _backend_filter !== null )
-        {
-            this._backend_filter = _backend_filter;
-            uri += '/' + _backend_filter.id + '/' + _backend_filter.value;
-        }
-        this.httpClient.get<T[]>( this._uri + uri ).subscribe(
+        this._pagedRequest = null;
+        this._filterRecord = filter;
+        this.list( _backend_filter, filter ).subscribe(
             data => {
                 this.dataChange.next( data );
             },
@@ -145,18 +203,60 @@ export class CrudDataService<T>
         return;
     }
 
+    /** Applies the filter record of the filter-header, the list is loaded again with the
+     *  filter applied by the database. In paged mode the list starts at the first page. */
+    public applyFilterRecord( filter: FilterRecord ): void
+    {
+        if ( filter !== null && Object.keys( filter ).length === 0 )
+        {
+            filter = null;
+        }
+        const request = this._pagedRequest;
+        if ( request !== null )
+        {
+            this.getPagedList( 0
+                               , request.pageSize
+                               , request.columns
+                               , request.columnSort
+                               , null
+                               , request.count
+                               , request.search
+                               , filter
+                               , null );
+        }
+        else
+        {
+            this.getAll( this._backend_filter, filter );
+        }
+        return;
+    }
+
+    public get filterRecord(): FilterRecord
+    {
+        return this._filterRecord;
+    }
+
     	public getPagedList( page: number
 						, pageSize: number
 						, columns: FilterColumn[]
-						, columnSort: BackendColumnSort = null ): void
+						, columnSort: BackendColumnSort = null
+						, lastKey: any = null
+						, count: string = 'exact'
+						, search: string = null
+						, filter: FilterRecord = null
+						, cursor: string = null ): void
 	{
-		this.pagedList( page, pageSize, columns, columnSort ).subscribe(
+		this._pagedRequest = { page, pageSize, columns, columnSort, lastKey, count, search, filter, cursor };
+		this._filterRecord = filter;
+		this.pagedList( page, pageSize, columns, columnSort, lastKey, count, search, filter, cursor ).subscribe(
 			data => {
 				console.log( "pagedList", data );
 				this.dataChange.next( data.records );
 				this._pageIndex = data.page;
 				this._pageSize = data.pageSize;
 				this._recordCount = data.recordCount;
+				this._nextCursor = data.nextCursor || null;
+				this._prevCursor = data.prevCursor || null;
 			},
 			(error: HttpErrorResponse) => {
 				throw new BackendError( error.message, error.error );
@@ -168,28 +268,226 @@ export class CrudDataService<T>
 	public pagedList( page: number
 					, pageSize: number
 					, columns: FilterColumn[]
-					, columnSort: BackendColumnSort = null ): Observable<FilteredList<T[]>>
+					, columnSort: BackendColumnSort = null
+					, lastKey: any = null
+					, count: string = 'exact'
+					, search: string = null
+					, filter: FilterRecord = null
+					, cursor: string = null ): Observable<FilteredList<T[]>>
     {
+		// lastKey is the primary key of the last record of the previous page, when sorting on
+		// the primary key the backend uses it instead of the page offset.
+		// count is 'exact', 'estimate' or 'none' for the recordCount in the result.
+		// search is matched against the text columns of the list view.
+		// filter is the filter record of the filter-header, it is applied by the database.
+		// cursor is the nextCursor or prevCursor of the previous result, the backend seeks the
+		// page from there instead of skipping the records of the page offset.
 		const params: FilteredListReq = {
 			page,
 			pageSize,
 			columns,
-			columnSort
+			columnSort,
+			lastKey,
+			count,
+			search,
+			filter,
+			cursor
 		};
 		return this.httpClient.post<FilteredList<T[]>>( this._uri + '/pagedlist',
 														params );
     }
 
 
-    public list( _backend_filter: any ): Observable<T[]>
+    /** Returns the cursor of the page when it is next to the last requested page with the
+     *  same page size, columns, sort order, search and filter, otherwise null. */
+    public pageCursor( page: number
+                       , pageSize: number
+                       , columns: FilterColumn[]
+                       , columnSort: BackendColumnSort = null
+                       , search: string = null
+                       , filter: FilterRecord = null ): string
+    {
+        const request = this._pagedRequest;
+        if ( request === null || request.pageSize !== pageSize || request.search !== search ||
+             JSON.stringify( [ request.columns, request.columnSort, request.filter ] ) !==
+             JSON.stringify( [ columns, columnSort, filter ] ) )
+        {
+            return ( null );
+        }
+        if ( page === request.page + 1 )
+        {
+            return ( this._nextCursor );
+        }
+        else if ( page === request.page - 1 && page > 0 )
+        {
+            return ( this._prevCursor );
+        }
+        return ( null );
+    }
+
+    /** Requests the page after the last requested page. */
+    public nextPage(): void
+    {
+        const request = this._pagedRequest;
+        if ( request !== null && this._nextCursor !== null )
+        {
+            this.getPagedList( request.page + 1, request.pageSize, request.columns, request.columnSort,
+                               null, request.count, request.search, request.filter, this._nextCursor );
+        }
+        return;
+    }
+
+    /** Requests the page before the last requested page. */
+    public prevPage(): void
+    {
+        const request = this._pagedRequest;
+        if ( request !== null && this._prevCursor !== null && request.page > 0 )
+        {
+            this.getPagedList( request.page - 1, request.pageSize, request.columns, request.columnSort,
+                               null, request.count, request.search, request.filter, this._prevCursor );
+        }
+        return;
+    }
+
+    /** Reloads the data in the same way as it was loaded, the full list or the last requested page. */
+    public refresh(): void
+    {
+        const request = this._pagedRequest;
+        if ( request !== null )
+        {
+            this.getPagedList( request.page
+                               , request.pageSize
+                               , request.columns
+                               , request.columnSort
+                               , request.lastKey
+                               , request.count
+                               , request.search
+                               , request.filter
+                               , request.cursor );
+        }
+        else
+        {
+            this.getAll( this._backend_filter, this._filterRecord );
+        }
+        return;
+    }
+
+    /** Returns the position of the record in data by its primary key, or -1. The index is
+     *  rebuilt when the data was reloaded. */
+    protected indexOfKey( key: any ): number
+    {
+        const data = this.data;
+        if ( this._keyIndexData !== data )
+        {
+            this._keyIndex = new Map<string, number>();
+            data.forEach( ( record, position ) => {
+                this._keyIndex.set( String( record[ this._primaryKey ] ), position );
+            } );
+            this._keyIndexData = data;
+        }
+        const position = this._keyIndex.get( String( key ) );
+        return ( position === undefined ? -1 : position );
+    }
+
+    /** Adds or replaces the record in data, without loading the data again. A page of the
+     *  paged list or a filtered list is loaded again for a new record, as the backend decides
+     *  on its position and whether it matches the filter. */
+    protected patchRecord( record: T ): void
+    {
+        if ( this._primaryKey === null || record === null || record === undefined )
+        {
+            this.refresh();
+            return;
+        }
+        const data = this.data;
+        const position = this.indexOfKey( record[ this._primaryKey ] );
+        if ( position >= 0 )
+        {
+            data[ position ] = record;
+        }
+        else if ( this._pagedRequest !== null || this._backend_filter || this._filterRecord )
+        {
+            // A new record may not match the filter of the list, the backend decides
+            this.refresh();
+            return;
+        }
+        else
+        {
+            this._keyIndex.set( String( record[ this._primaryKey ] ), data.length );
+            data.push( record );
+        }
+        this.dataChange.next( data );
+        return;
+    }
+
+    /** Removes the record from data by its primary key, without loading the data again. */
+    protected removeRecord( key: any ): void
+    {
+        if ( this._primaryKey === null || this._pagedRequest !== null )
+        {
+            this.refresh();
+            return;
+        }
+        const data = this.data;
+        const position = this.indexOfKey( key );
+        if ( position >= 0 )
+        {
+            data.splice( position, 1 );
+            this._keyIndex.delete( String( key ) );
+            for ( let index = position; index < data.length; index++ )
+            {
+                this._keyIndex.set( String( data[ index ][ this._primaryKey ] ), index );
+            }
+            this.dataChange.next( data );
+        }
+        return;
+    }
+
+    public list( _backend_filter: any, filter: FilterRecord = null ): Observable<T[]>
     {
         let uri = '/list';
+        this._backend_filter = _backend_filter;
         if ( _backend_filter !== null )
         {
-            this._backend_filter = _backend_filter;
             uri += '/' + _backend_filter.id + '/' + _backend_filter.value;
         }
-        return this.httpClient.get<T[]>( this._uri + uri );
+        let params = new HttpParams();
+        if ( filter !== null )
+        {
+            params = params.set( 'filter', JSON.stringify( filter ) );
+        }
+        return this.httpClient.get<T[]>( this._uri + uri, { params: params } );
+    }
+
+    /** Gets the select list, the backend answers 304 when the cached list is still valid. */
+    protected selectList( listParams: HttpParams ): Observable<PytSelectList[]>
+    {
+        const key = this._uri + '?' + listParams.toString();
+        const cached = selectListCache.get( key );
+        let headers = new HttpHeaders();
+        if ( cached !== undefined )
+        {
+            headers = headers.set( 'If-None-Match', cached.etag );
+        }
+        return this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams,
+                                                                              headers: headers,
+                                                                              observe: 'response' } ).pipe(
+            map( response => {
+                const etag = response.headers.get( 'ETag' );
+                if ( etag !== null )
+                {
+                    selectListCache.set( key, { etag: etag, data: response.body } );
+                }
+                return response.body.slice();
+            } ),
+            catchError( ( error: HttpErrorResponse ) => {
+                if ( error.status === 304 && cached !== undefined )
+                {
+                    return of( cached.data.slice() );
+                }
+                return throwError( error );
+            } )
+        );
     }
 
     public getSelectListSimple( value: string, label: string, initial: any = null, final: any = null ): Observable<PytSelectList[]>
@@ -203,7 +501,7 @@ export class CrudDataService<T>
         {
             listParams.set( 'final', final );
         }
-        return this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams } );
+        return this.selectList( listParams );
     }
 
     public getSelectList( value: string, label: string, initial: any = null, final: any = null ): Observable<PytSelectList[]>
@@ -218,7 +516,7 @@ export class CrudDataService<T>
             listParams.set( 'final', final );
         }
         return ( Observable.create( observer => {
-            this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams } )
+            this.selectList( listParams )
             .subscribe( ( data ) => {
                     if ( this.debug )
                     {
@@ -246,7 +544,7 @@ export class CrudDataService<T>
             listParams.set( 'final', final );
         }
         return ( Observable.create( observer => {
-            this.httpClient.get<PytSelectList[]>( this._uri + '/select', { params: listParams } )
+            this.selectList( listParams )
             .subscribe( ( data ) => {
                     if ( this.debug )
                     {
@@ -321,7 +619,7 @@ export class CrudDataService<T>
             {
                 console.log( result );
             }
-            this.getAll( this._backend_filter );
+            this.patchRecord( result );
         },
         (error: HttpErrorResponse) => {
             throw new BackendError( error.message, error.error );
@@ -377,7 +675,7 @@ export class CrudDataService<T>
             {
                 console.log ( result );
             }
-            this.getAll( this._backend_filter );
+            this.patchRecord( result );
         },
         (error: HttpErrorResponse) => {
             throw new BackendError( error.message, error.error );
@@ -393,7 +691,7 @@ export class CrudDataService<T>
             {
                 console.log ( result );
             }
-            this.getAll( this._backend_filter );
+            this.removeRecord( record );
         },
         (error: HttpErrorResponse) => {
             throw new BackendError( error.message, error.error );
@@ -401,6 +699,44 @@ export class CrudDataService<T>
         return;
     }
 
+    /** Adds the records in chunked transactions, the result has the result per record by index. */
+    public bulkAdd( records: T[] ): Observable<BulkResult>
+    {
+        return this.bulkRequest( '/bulk/new', records );
+    }
+
+    /** Updates the records by their primary key, the result has the result per record by index. */
+    public bulkUpdate( records: T[] ): Observable<BulkResult>
+    {
+        return this.bulkRequest( '/bulk/update', records );
+    }
+
+    /** Deletes the records or primary keys, the result has the result per record by index. */
+    public bulkDelete( records: any[] ): Observable<BulkResult>
+    {
+        return this.bulkRequest( '/bulk/delete', records );
+    }
+
+    protected bulkRequest( uri: string, records: any[] ): Observable<BulkResult>
+    {
+        if ( this.debug )
+        {
+            console.log( 'bulkRequest', uri, records.length );
+        }
+        return this.httpClient.post<BulkResult>( this._uri + uri, { records } ).pipe(
+            tap( result => {
+                if ( this.debug )
+                {
+                    console.log( result );
+                }
+                this.refresh();
+            },
+            ( error: HttpErrorResponse ) => {
+                throw new BackendError( error.message, error.error );
+            } )
+        );
+    }
+
     public genericPut( uri: string, params: any ): void
     {
         console.log( 'genericPut', uri, params );
@@ -428,6 +764,36 @@ export class CrudDataService<T>
         return this.httpClient.post( this._uri + uri, body );
     }
 
+    /** Gets all the records, optionally filtered, as 'ndjson' or 'csv' from the streaming
+     *  export endpoint of the backend. */
+    public exportRecords( format: string = 'csv', filter: FilterRecord = null ): Observable<Blob>
+    {
+        let params = new HttpParams().set( 'format', format );
+        if ( filter !== null )
+        {
+            params = params.set( 'filter', JSON.stringify( filter ) );
+        }
+        return this.httpClient.get( this._uri + '/export', { params: params,
+                                                             responseType: 'blob' } );
+    }
+
+    /** Exports the records and offers them to the user as a download. */
+    public downloadExport( format: string = 'csv', filter: FilterRecord = null ): void
+    {
+        this.exportRecords( format, filter ).subscribe( data => {
+            const url = URL.createObjectURL( data );
+            const link = document.createElement( 'a' );
+            link.href = url;
+            link.download = this._uri.split( '/' ).pop() + '.' + format;
+            link.click();
+            URL.revokeObjectURL( url );
+        },
+        ( error: HttpErrorResponse ) => {
+            throw new BackendError( error.message, error.error );
+        } );
+        return;
+    }
+
     public downloadFile( filename: string, reqParams: any ): Observable<any>
     {
         const options = new HttpHeaders( { 'Content-Type': 'application/octet-stream' } );
@@ -21,10 +21,10 @@
 import { EventEmitter } from '@angular/core';
 import { DataSource } from '@angular/cdk/collections';
 import { PageEvent } from '@angular/material';
-import { BehaviorSubject, merge, Observable } from 'rxjs';
+import { BehaviorSubject, merge, Observable, Subscription } from 'rxjs';
 import { MatPaginator, MatSort } from '@angular/material';
-import { map } from 'rxjs/operators';
-import { CrudDataService } from './crud-dataservice';
+import { debounceTime, map, startWith } from 'rxjs/operators';
+import { CrudDataService, FilterColumn, BackendColumnSort } from './crud-dataservice';
 import * as moment from 'moment';
 
 
@@ -60,6 +60,12 @@ export class CrudDataSource<T> extends DataSource<T>
         this._filterChange.next( filter );
     }
 
+    /** The number of records for the paginator. */
+    public get length(): number
+    {
+        return ( this.filteredData.length );
+    }
+
     protected castRecord( record: any ): T
     {
         return ( record );
@@ -161,3 +167,97 @@ export class CrudDataSource<T> extends DataSource<T>
         return ( value );
     }
 }
+
+
+/**
+ *  Datasource that leaves the filtering, sorting and paging to the backend, the
+ *  paginator, sort and filter changes are debounced into one request for the page
+ *  to display. Only the records of that page are held by the browser.
+ */
+export class CrudServerDataSource<T> extends CrudDataSource<T>
+{
+    /** Milliseconds to wait for more changes before the page is requested. */
+    public debounce: number = 300;
+    protected _requests: Subscription = null;
+
+    constructor( public _databaseTable: CrudDataService<T>,
+                 public _paginator: MatPaginator,
+                 public _sort: MatSort,
+                 public pageEvent: EventEmitter<PageEvent>,
+                 protected _backend_filter: any )
+    {
+        super( _databaseTable, _paginator, _sort, pageEvent, _backend_filter );
+        // Reset to the first page when the user changes the sort order.
+        this._sort.sortChange.subscribe(() => this._paginator.pageIndex = 0);
+    }
+
+    public get length(): number
+    {
+        return ( this._databaseTable._recordCount || 0 );
+    }
+
+    /** Connect function called by the table to retrieve one stream containing the data to render. */
+    public connect(): Observable<T[]>
+    {
+        const pageChanges = [
+            this._sort.sortChange,
+            this._filterChange,
+            this.pageEvent
+        ];
+
+        this.disconnect();
+        this._requests = merge(...pageChanges).pipe(
+            debounceTime( this.debounce ),
+            startWith( null )
+        ).subscribe( () => this.requestPage() );
+
+        return this._databaseTable.dataChange.pipe(map( ( data: any[] ) => {
+            this.filteredData = this.castRecords( data );
+            this.renderedData = this.filteredData;
+            return ( this.renderedData );
+        } ) );
+    }
+
+    public disconnect(): void
+    {
+        if ( this._requests !== null )
+        {
+            this._requests.unsubscribe();
+            this._requests = null;
+        }
+        return;
+    }
+
+    /** Requests the current page with the filter and sort order from the backend. */
+    protected requestPage(): void
+    {
+        const columns: FilterColumn[] = [];
+        if ( this._backend_filter !== null )
+        {
+            columns.push( { column: this._backend_filter.id, value: this._backend_filter.value } );
+        }
+        let columnSort: BackendColumnSort = null;
+        if ( this._sort.active && this._sort.direction !== '' )
+        {
+            columnSort = { column: this._sort.active, direction: this._sort.direction };
+        }
+        // Moving one page forward or back seeks from the cursor, so deep pages cost the same
+        // as the first page; the first page and jumps use the page offset
+        const search = this.filter || null;
+        const cursor = this._databaseTable.pageCursor( this._paginator.pageIndex
+                                                       , this._paginator.pageSize
+                                                       , columns
+                                                       , columnSort
+                                                       , search );
+        this._databaseTable.getPagedList( this._paginator.pageIndex
+                                          , this._paginator.pageSize
+                                          , columns
+                                          , columnSort
+                                          , null
+                                          , 'exact'
+                                          , search
+                                          , null
+                                          , cursor );
+        return;
+    }
+}
@@ -4,7 +4,7 @@ import { MatDialog, MatPaginator, MatSort, PageEvent } from '@angular/material';
 import { ElementRef, ViewChild, EventEmitter, Input, OnInit, OnDestroy } from '@angular/core';
 import { CrudDataSource } from './crud-datasource';
 import { ActivatedRoute } from '@angular/router';
-import { CrudDataService } from './crud-dataservice';
+import { CrudDataService, FilterRecord } from './crud-dataservice';
 
 export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDestroy
 {
@@ -15,6 +15,7 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
     protected backendFilter: any = null;
     public pageSize: number = 10;
     public pageIndex: number = 0;
+    public columnFilter: FilterRecord = {};
     public paginatorEvent: EventEmitter<PageEvent>;
     dataSource: CrudDataSource<T>  | null;
 
@@ -40,6 +41,13 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
         return;
     }
 
+    // The filter-header components of the columns emit this record with the applied filters
+    public applyColumnFilter( filter: FilterRecord ): void
+    {
+        this.dataService.applyFilterRecord( filter );
+        return;
+    }
+
     public ngOnInit(): void
     {
         let tmp = localStorage.getItem( this.componentName + '.size' );
@@ -128,13 +136,8 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
             console.log( 'editRecord() dialog result ', result );
             if ( result === 1 )
             {
-                // When using an edit things are little different,
-                // firstly we find record inside DataService by id
-                console.log( 'editRecord() updating index ', foundIndex );
-                // Then you update that record using data from
-                // dialogData (values you entered)
-                this.dataService.dataChange.value[ foundIndex ] = this.dataService.getDialogData();
-                // And lastly refresh table
+                // The data service replaces the record by its primary key with the
+                // record returned by the backend
                 this.refreshTable();
             }
             else
@@ -183,10 +186,7 @@ export class TableBaseComponent<T> extends Subscribers implements OnInit, OnDest
             console.log( 'deleteItem() dialog result ', result );
             if ( result === 1 )
             {
-                const foundIndex = this.dataService.dataChange.value.findIndex( x =>
-                                    x[ 0 ] === this.id );
-                console.log( 'deleteItem() removing index ', foundIndex );
-                this.dataService.dataChange.value.splice( foundIndex, 0 );
+                // The data service removes the record by its primary key
                 this.refreshTable();
             }
             else
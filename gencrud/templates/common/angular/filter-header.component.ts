@@ -55,7 +55,7 @@ export class FilterItemDirective
 	</div>
 	<div mat-menu-item mat-filter-item [disableRipple]="true">
 		<mat-form-field>
-		<mat-select [panelClass]="'mat-elevation-z10'" placeholder='Conditions' [(value)]="searchCondition.position">
+		<mat-select [panelClass]="'mat-elevation-z10'" placeholder='Conditions' [(value)]="condition">
 			<mat-option *ngFor="let condition of conditionsList" [value]="condition.value" class="cond_option">
 				{{ condition.label }}
 			</mat-option>
@@ -64,7 +64,7 @@ export class FilterItemDirective
 	</div>
 	<div mat-menu-item mat-filter-item [disableRipple]="true">
 		<mat-form-field>
-			<input matInput placeholder="Value" [(ngModel)]="filterRecord[ field ]">
+			<input matInput placeholder="Value" [(ngModel)]="value">
 		</mat-form-field>
 	</div>
 	<div mat-menu-item [disableRipple]="true">
@@ -81,7 +81,8 @@ export class FilterItemDirective
 export class FilterHeaderComponent implements OnInit
 {
 	public 		filter: any;
-	public 		searchCondition: any = {};
+	public 		condition: string = 'EQ';
+	public 		value: any = null;
 	public 		conditionsList = CONDITIONS_LIST;
 	@Input()	title: string;
 	@Input()	field: string;
@@ -98,6 +99,15 @@ export class FilterHeaderComponent implements OnInit
 
 	public ngOnInit(): void
 	{
+		if ( this.filterRecord && this.filterRecord[ this.field ] )
+		{
+			this.condition = this.filterRecord[ this.field ].condition;
+			this.value = this.filterRecord[ this.field ].value;
+		}
+		if ( !this.dataSource )
+		{
+			return;
+		}
 		this.dataSource.filterPredicate = ( p: any, filtre: any ) => {
 			let result = true;
 			// keys of the object data 
@@ -123,16 +133,27 @@ export class FilterHeaderComponent implements OnInit
 
 	public clearColumnFilter( columnKey: string ): void
 	{
-		console.log( "clearColumnFilter", this.filterRecord );
-		this.filterRecord[ columnKey ] = null;
-		this.searchCondition.position = 0;
-		this.applyColumnFilter();
+		delete this.filterRecord[ columnKey ];
+		this.condition = 'EQ';
+		this.value = null;
+		this.clearFilter.emit( this.filterRecord );
 		return;
 	}
 
-	public applyColumnFilter(): void 
+	public applyColumnFilter(): void
 	{
-		console.log( "applyColumnFilter", this.filterRecord );
+		// The filter record holds the filters of all the columns, the backend compiles
+		// them into the query, see sqlfilter.py
+		if ( this.condition === 'EM' || this.condition === '!EM' ||
+			 ( this.value !== null && this.value !== '' ) )
+		{
+			this.filterRecord[ this.field ] = { condition: this.condition, value: this.value };
+		}
+		else
+		{
+			delete this.filterRecord[ this.field ];
+		}
+		this.applyFilter.emit( this.filterRecord );
 		return;
 	}
 }
@@ -16,9 +16,11 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
+import logging
 import datetime
 import sqlalchemy.sql.sqltypes
 from dateutil import tz
+from .datetimes import parseIsoDateTime, convertDateTime
 
 try:
     import webapp2.api as API
@@ -28,144 +30,166 @@ except ModuleNotFoundError:
         "on https://github.com/pe2mbs/gencrud/blob/master/doc/MANUAL.md")
 
 
-def convertDateTime( value ):
-    value = value[ 0:22 ] + value[ 23: ]
-    API.app.logger.debug( 'datetime.datetime.value: {}'.format( value ) )
-    if value.startswith( '0000-00-00' ):
-        value = datetime.datetime.utcnow()
+# The timezones are created once and shared
+UTC_ZONE    = tz.tzutc()
+LOCAL_ZONE  = tz.tzlocal()
 
-    elif not value[ 0 ].isdigit():
-        # 'Tue Aug 19 1975 23:15:30 GMT+0200 (CEST)'
-        value = value.split( '(' )[ 0 ].strip()
-        try:
-            value = datetime.datetime.strptime( value,'%a %b %d %Y %H:%M:%S %Z%z' )
 
-        except Exception:
-            value = datetime.datetime.strptime( value,'%a %b %d %Y %H:%M:%S %z%Z' )
+def convertInteger( value, default ):
+    try:
+        if value is not None:
+            value = int( str( value ) )
 
-    # ELSE starts with digit
-    elif value.endswith( 'Z' ):
-        # ISO format without timezone
-        value = datetime.datetime.strptime( value,'%Y-%m-%dT%H:%M:%S.%fZ' )
+        elif default is not None:
+            value = default
 
-    elif 'T' in value:
-        # ISO format with timezone
-        if '+' in value:
-            value = datetime.datetime.strptime( value, '%Y-%m-%dT%H:%M:%S.%f%z' )
+    except:
+        if isinstance( default,int ):
+            value = default
 
         else:
-            value = datetime.datetime.strptime( value,'%Y-%m-%dT%H:%M:%S%z' )
-
-    else:
-        # Plain format, local time ?
-        value = datetime.datetime.strptime( value,'%Y-%m-%d %H:%M:%S' )
+            value = 0
 
     return value
 
 
-def fieldConversion( record, key, value, default = None ):
+def convertFloat( value, default ):
     try:
-        _type = record.__table__.columns[ key ].type
-
-    except Exception:
-        _type = record.__table__.columns[ key.lower() ].type
-
-    API.app.logger.debug( 'field {0} value {1} type {2}'.format( key, value, str( _type ) ) )
-    if isinstance( _type, ( sqlalchemy.sql.sqltypes.Integer,
-                            sqlalchemy.sql.sqltypes.INTEGER,
-                            sqlalchemy.sql.sqltypes.BigInteger,
-                            sqlalchemy.sql.sqltypes.INT,
-                            sqlalchemy.sql.sqltypes.BIGINT ) ):
-        try:
-            if value is not None:
-                value = int( str( value ) )
-
-            elif default is not None:
-                value = default
-
-        except:
-            if isinstance( default,int ):
-                value = default
-
-            else:
-                value = 0
-
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.REAL,
-                              sqlalchemy.sql.sqltypes.Float,
-                              sqlalchemy.sql.sqltypes.FLOAT,
-                              sqlalchemy.sql.sqltypes.DECIMAL,
-                              sqlalchemy.sql.sqltypes.Numeric,
-                              sqlalchemy.sql.sqltypes.NUMERIC ) ):
-        try:
-            if value is not None:
-                value = float( str( value ) )
-
-            elif default is not None:
-                value = default
-
-        except:
-            if isinstance( default, float ):
-                value = default
-
-            else:
-                value = 0.0
-
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.DateTime,
-                              sqlalchemy.sql.sqltypes.DATETIME,
-                              sqlalchemy.sql.sqltypes.TIMESTAMP ) ):
         if value is not None:
-            value = convertDateTime( value )
+            value = float( str( value ) )
 
         elif default is not None:
             value = default
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.Date,
-                              sqlalchemy.sql.sqltypes.DATE ) ):
-        # TODO: needs to be tested
-        API.app.logger.debug( "Type date: '{}'".format( value ) )
-        if value is not None:
-            # UTC format, need to add local time diff
-            if 'T' in value:
-                utc  = convertDateTime( value )
-                from_zone = tz.tzutc()
-                to_zone = tz.tzlocal()
-                utc = utc.replace( tzinfo = from_zone )
-                value = utc.astimezone( to_zone )
-                API.app.logger.debug( "Type datetime: '{}'".format( value ) )
-
-            else:
-                value = datetime.datetime.strptime( value, '%Y-%m-%d' )
-
-            API.app.logger.debug( "Type date: '{}'".format( value ) )
-            value = value.date()
-            API.app.logger.debug( "Type date: '{}'".format( value ) )
-
-        elif default is not None:
+    except:
+        if isinstance( default, float ):
             value = default
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.Time,
-                              sqlalchemy.sql.sqltypes.TIME ) ):
-        # TODO: needs to be tested
-        if value is not None:
-            value = datetime.datetime.strptime( value, '%H:%M:%S' ).time()
+        else:
+            value = 0.0
 
-        elif default is not None:
-            value = default
+    return value
+
+
+def convertDateTimeField( value, default ):
+    if value is not None:
+        value = convertDateTime( value )
+
+    elif default is not None:
+        value = default
+
+    return value
+
+
+def convertDate( value, default ):
+    # TODO: needs to be tested
+    API.app.logger.debug( "Type date: '%s'", value )
+    if value is not None:
+        # UTC format, need to add local time diff
+        if 'T' in value:
+            utc = convertDateTime( value )
+            utc = utc.replace( tzinfo = UTC_ZONE )
+            value = utc.astimezone( LOCAL_ZONE )
+            API.app.logger.debug( "Type datetime: '%s'", value )
+
+        else:
+            value = datetime.datetime.strptime( value, '%Y-%m-%d' )
+
+        value = value.date()
+        API.app.logger.debug( "Type date: '%s'", value )
+
+    elif default is not None:
+        value = default
 
-    elif isinstance( _type, ( sqlalchemy.sql.sqltypes.Boolean,
-                              sqlalchemy.sql.sqltypes.BOOLEAN ) ):
-        if type( value ) is int:
-            value = bool( value )
+    return value
 
-        elif type( value ) is str:
-            value = bool( value )
 
-        elif value is None:
-            if default is not None:
-                value = default
+def convertTime( value, default ):
+    # TODO: needs to be tested
+    if value is not None:
+        value = datetime.datetime.strptime( value, '%H:%M:%S' ).time()
 
-            else:
-                value = False
+    elif default is not None:
+        value = default
 
-    API.app.logger.debug( 'field {0} value {1}'.format( key, value ) )
     return value
+
+
+def convertBoolean( value, default ):
+    if type( value ) is int:
+        value = bool( value )
+
+    elif type( value ) is str:
+        value = bool( value )
+
+    elif value is None:
+        if default is not None:
+            value = default
+
+        else:
+            value = False
+
+    return value
+
+
+def convertNone( value, default ):
+    return value
+
+
+# The converter of the column types, the first matching type is used
+CONVERTERS = ( ( ( sqlalchemy.sql.sqltypes.Integer,
+                   sqlalchemy.sql.sqltypes.INTEGER,
+                   sqlalchemy.sql.sqltypes.BigInteger,
+                   sqlalchemy.sql.sqltypes.INT,
+                   sqlalchemy.sql.sqltypes.BIGINT ), convertInteger ),
+               ( ( sqlalchemy.sql.sqltypes.REAL,
+                   sqlalchemy.sql.sqltypes.Float,
+                   sqlalchemy.sql.sqltypes.FLOAT,
+                   sqlalchemy.sql.sqltypes.DECIMAL,
+                   sqlalchemy.sql.sqltypes.Numeric,
+                   sqlalchemy.sql.sqltypes.NUMERIC ), convertFloat ),
+               ( ( sqlalchemy.sql.sqltypes.DateTime,
+                   sqlalchemy.sql.sqltypes.DATETIME,
+                   sqlalchemy.sql.sqltypes.TIMESTAMP ), convertDateTimeField ),
+               ( ( sqlalchemy.sql.sqltypes.Date,
+                   sqlalchemy.sql.sqltypes.DATE ), convertDate ),
+               ( ( sqlalchemy.sql.sqltypes.Time,
+                   sqlalchemy.sql.sqltypes.TIME ), convertTime ),
+               ( ( sqlalchemy.sql.sqltypes.Boolean,
+                   sqlalchemy.sql.sqltypes.BOOLEAN ), convertBoolean ) )
+
+# The converters of the columns of a model, by model class
+_fieldConverters = {}
+
+
+def fieldConverters( model ) -> dict:
+    """Returns the converters of the columns of the model by column name, these are
+    looked up once per model.
+    """
+    converters = _fieldConverters.get( model )
+    if converters is None:
+        converters = {}
+        for column in model.__table__.columns:
+            converter = convertNone
+            for types, typeConverter in CONVERTERS:
+                if isinstance( column.type, types ):
+                    converter = typeConverter
+                    break
+
+            converters[ column.key ] = converter
+
+        _fieldConverters[ model ] = converters
+
+    return converters
+
+
+def fieldConversion( record, key, value, default = None ):
+    converters = fieldConverters( type( record ) )
+    converter = converters.get( key )
+    if converter is None:
+        converter = converters[ key.lower() ]
+
+    if API.app.logger.isEnabledFor( logging.DEBUG ):
+        API.app.logger.debug( 'field %s value %s converter %s', key, value, converter.__name__ )
+
+    return converter( value, default )
@@ -0,0 +1,95 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+#   Parses the date/time values that the frontend sends, without strptime() and
+#   without the packages of the application, so it can be tested on its own.
+#
+import re
+import datetime
+
+
+# ISO 8601 date and time, for the forms that datetime.fromisoformat() does not accept
+ISO_DATETIME    = re.compile( r'^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?'
+                              r'\s*(?:([+-])(\d{2}):?(\d{2}))?$' )
+# The JavaScript Date.toString() format; 'Tue Aug 19 1975 23:15:30 GMT+0200 (CEST)'
+JS_DATETIME     = re.compile( r'^[A-Za-z]{3},? ([A-Za-z]{3}) (\d{1,2}) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})'
+                              r'(?: (GMT|UTC)(?:([+-])(\d{2}):?(\d{2}))?)?' )
+MONTHS          = { name: index + 1 for index, name in enumerate( ( 'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                                                                    'jul', 'aug', 'sep', 'oct', 'nov', 'dec' ) ) }
+# The fixed offset timezones, by offset in minutes
+_timezones      = {}
+
+
+def fixedTimezone( sign, hours, minutes ):
+    offset = int( hours ) * 60 + int( minutes )
+    if sign == '-':
+        offset = -offset
+
+    timezone = _timezones.get( offset )
+    if timezone is None:
+        timezone = datetime.timezone( datetime.timedelta( minutes = offset ) )
+        _timezones[ offset ] = timezone
+
+    return timezone
+
+
+def parseIsoDateTime( value ):
+    try:
+        return datetime.datetime.fromisoformat( value )
+
+    except ( ValueError, AttributeError ):
+        # fromisoformat() is new in Python 3.7, the regular expression handles the rest
+        pass
+
+    match = ISO_DATETIME.match( value )
+    if match is None:
+        raise ValueError( "Invalid ISO date/time '{}'".format( value ) )
+
+    year, month, day, hour, minute, second, fraction, sign, tzHours, tzMinutes = match.groups()
+    return datetime.datetime( int( year ), int( month ), int( day ),
+                              int( hour ), int( minute ), int( second or 0 ),
+                              int( ( fraction or '0' ).ljust( 6, '0' ) ),
+                              None if sign is None else fixedTimezone( sign, tzHours, tzMinutes ) )
+
+
+def convertDateTime( value ):
+    if value.startswith( '0000-00-00' ):
+        return datetime.datetime.utcnow()
+
+    if value[ 0 ].isdigit():
+        if value.endswith( 'Z' ):
+            # ISO format in UTC, without timezone
+            return parseIsoDateTime( value[ :-1 ] )
+
+        # ISO format with timezone or plain format, local time ?
+        return parseIsoDateTime( value )
+
+    # 'Tue Aug 19 1975 23:15:30 GMT+0200 (CEST)'
+    match = JS_DATETIME.match( value )
+    month = None if match is None else MONTHS.get( match.group( 1 ).lower() )
+    if month is None:
+        raise ValueError( "Invalid date/time '{}'".format( value ) )
+
+    _, day, year, hour, minute, second, zone, sign, tzHours, tzMinutes = match.groups()
+    if sign is not None:
+        timezone = fixedTimezone( sign, tzHours, tzMinutes )
+
+    else:
+        timezone = None if zone is None else datetime.timezone.utc
+
+    return datetime.datetime( int( year ), month, int( day ), int( hour ), int( minute ), int( second ), 0, timezone )
@@ -0,0 +1,166 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+#   Compiles the filter record of the filter-header component of the frontend into
+#   SQLAlchemy expressions, so the filtering is done by the database.
+#
+#   The filter record is a dictionary of { column: { condition, value } }, the
+#   conditions are the CONDITIONS_LIST of filter-header.component.ts;
+#
+#       EQ, !EQ         equal, not equal
+#       GT, GT|EQ       greater than, greater or equal
+#       LE, LE|EQ       less than, less or equal
+#       CO, !CO         contains, not contains
+#       EM, !EM         empty, not empty
+#
+import json
+import sqlalchemy
+from sqlalchemy import and_, or_, not_, cast
+from .common import fieldConversion
+
+
+class FilterError( ValueError ):
+    """Raised for an invalid filter record, the views answer it with 400."""
+
+
+# The columns of a model by attribute name as ( attribute, text column ), by model class
+_filterColumns = {}
+
+
+def filterColumns( model ) -> dict:
+    columns = _filterColumns.get( model )
+    if columns is None:
+        columns = {}
+        for prop in sqlalchemy.inspect( model ).column_attrs:
+            columns[ prop.key ] = ( getattr( model, prop.key ),
+                                    isinstance( prop.columns[ 0 ].type, sqlalchemy.String ) )
+
+        _filterColumns[ model ] = columns
+
+    return columns
+
+
+def likePattern( value ) -> str:
+    value = str( value ).replace( '\\', '\\\\' ).replace( '%', '\\%' ).replace( '_', '\\_' )
+    return '%{}%'.format( value )
+
+
+def containsExpression( attribute, text, value, dialect ):
+    if not text:
+        attribute = cast( attribute, sqlalchemy.String )
+
+    if dialect == 'postgresql':
+        # ILIKE can use a pg_trgm index on the column
+        return attribute.ilike( likePattern( value ), escape = '\\' )
+
+    # The default collations of the other databases are case insensitive, LIKE keeps the
+    # column as is where ilike() would wrap it in lower() and rule out an index
+    return attribute.like( likePattern( value ), escape = '\\' )
+
+
+def emptyExpression( attribute, text ):
+    if text:
+        return or_( attribute.is_( None ), attribute == '' )
+
+    return attribute.is_( None )
+
+
+def compileCondition( model, name, attribute, text, condition, value, dialect ):
+    if condition == 'EM':
+        return emptyExpression( attribute, text )
+
+    elif condition == '!EM':
+        return not_( emptyExpression( attribute, text ) )
+
+    if value is None or value == '':
+        # The condition is not filled in yet
+        return None
+
+    if condition == 'CO':
+        return containsExpression( attribute, text, value, dialect )
+
+    elif condition == '!CO':
+        return or_( attribute.is_( None ), not_( containsExpression( attribute, text, value, dialect ) ) )
+
+    try:
+        value = fieldConversion( model(), name, value )
+
+    except Exception as exc:
+        raise FilterError( "Invalid value for {}: {}".format( name, exc ) )
+
+    if condition == 'EQ':
+        return attribute == value
+
+    elif condition == '!EQ':
+        return or_( attribute.is_( None ), attribute != value )
+
+    elif condition == 'GT':
+        return attribute > value
+
+    elif condition == 'GT|EQ':
+        return attribute >= value
+
+    elif condition == 'LE':
+        return attribute < value
+
+    elif condition == 'LE|EQ':
+        return attribute <= value
+
+    raise FilterError( "Invalid condition {} for {}".format( condition, name ) )
+
+
+def compileFilter( model, filterRecord, dialect = None ):
+    """Returns the SQLAlchemy expression of the filter record, or None when it does not
+    filter. The filter record may be passed as a JSON string, as done by the query
+    string of the GET endpoints. Only the columns of the model are accepted.
+    """
+    if filterRecord is None or filterRecord == '':
+        return None
+
+    if isinstance( filterRecord, str ):
+        try:
+            filterRecord = json.loads( filterRecord )
+
+        except ValueError:
+            raise FilterError( "Invalid filter, not a JSON object" )
+
+    if not isinstance( filterRecord, dict ):
+        raise FilterError( "Invalid filter, not an object" )
+
+    columns = filterColumns( model )
+    expressions = []
+    for name, spec in filterRecord.items():
+        if name not in columns:
+            raise FilterError( "Invalid filter column {}".format( name ) )
+
+        if spec is None:
+            continue
+
+        if not isinstance( spec, dict ):
+            raise FilterError( "Invalid filter for {}, expected condition and value".format( name ) )
+
+        attribute, text = columns[ name ]
+        expression = compileCondition( model, name, attribute, text, spec.get( 'condition', 'EQ' ),
+                                       spec.get( 'value' ), dialect )
+        if expression is not None:
+            expressions.append( expression )
+
+    if len( expressions ) == 0:
+        return None
+
+    return and_( *expressions )
@@ -24,6 +24,10 @@ class ModuleExistsAlready( Exception ):
         super( ModuleExistsAlready, self ).__init__( path )
         return
 
+    def __reduce__( self ):
+        # The object is not passed back from a code generation worker process
+        return ( ModuleExistsAlready, ( None, ) + self.args )
+
 
 class InvalidSetting( Exception ):
     def __init__( self, prop, entity, name, expected = None ):
@@ -56,6 +60,27 @@ class InvalidSetting( Exception ):
         return
 
 
+class InvalidFieldDefinition( InvalidSetting ):
+    def __init__( self, table, field, position, message ):
+        self.__table    = table
+        self.__field    = field
+        self.__position = position
+        Exception.__init__( self, 'field in table {table} at position {pos}: {message}\n    {field}\n    {marker}^'.
+                                  format( table = table,
+                                          pos = position + 1,
+                                          message = message,
+                                          field = field,
+                                          marker = ' ' * position ) )
+        return
+
+
+class IncludeCycle( Exception ):
+    def __init__( self, filenames ):
+        self.__filenames = filenames
+        super( IncludeCycle, self ).__init__( 'Include cycle: {}'.format( ' -> '.join( filenames ) ) )
+        return
+
+
 class MissingTemplate( Exception ):
     def __init__( self, template ):
         self.__template = template
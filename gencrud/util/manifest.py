@@ -0,0 +1,189 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+import os
+import json
+import hashlib
+import logging
+import gencrud.version
+from gencrud.constants import *
+from gencrud.util.sha import sha256sum
+from gencrud.util.output import writeFile
+
+logger = logging.getLogger()
+
+C_FINGERPRINT   = 'fingerprint'
+C_FILES         = 'files'
+C_EXPORTS       = 'exports'
+
+# The digests of the template files, by absolute filename
+_digests = {}
+
+
+def templateDigest( filename ) -> str:
+    digest = _digests.get( filename )
+    if digest is None:
+        digest = sha256sum( filename )
+        _digests[ filename ] = digest
+
+    return digest
+
+
+class Manifest( object ):
+    """The manifest of the generated objects in a source folder.
+
+    For each object it records the fingerprint of the inputs, the generated files
+    and the exported Angular components, so that an incremental run can skip the
+    objects of which the inputs did not change.
+    """
+    def __init__( self, folder ):
+        self.__folder   = folder
+        self.__filename = os.path.join( folder, C_MANIFEST_FILE )
+        self.__objects  = {}
+        self.__updated  = {}
+        if os.path.isfile( self.__filename ):
+            try:
+                with open( self.__filename, 'r' ) as stream:
+                    data = json.load( stream )
+
+                if data.get( C_VERSION ) == gencrud.version.__version__:
+                    self.__objects = data.get( C_OBJECTS, {} )
+
+            except ValueError:
+                logger.warning( "Ignoring invalid manifest {}".format( self.__filename ) )
+
+        return
+
+    @staticmethod
+    def key( config, cfg ) -> str:
+        return '{}.{}'.format( config.application, cfg.name )
+
+    @staticmethod
+    def fingerprint( config, cfg, templates: list, *args ) -> str:
+        """Returns the fingerprint of the inputs of an object; the gencrud version, the
+        root settings of the configuration, the object subtree, the templates and
+        any extra input passed in 'args'.
+        """
+        root = { key: value for key, value in config.dictionary.items() if key != C_OBJECTS }
+        inputs = [ gencrud.version.__version__,
+                   root,
+                   cfg.dictionary,
+                   [ config.options.useModule,
+                     config.options.lazyLoading,
+                     config.options.ignoreCaseDbIds ],
+                   [ ( os.path.basename( templ ), templateDigest( templ ) ) for templ in sorted( templates ) ],
+                   list( args ) ]
+        return hashlib.sha256( json.dumps( inputs,
+                                           sort_keys = True,
+                                           default = str ).encode( 'utf-8' ) ).hexdigest()
+
+    def unchanged( self, key, fingerprint ) -> bool:
+        entry = self.__objects.get( key )
+        if entry is None or entry.get( C_FINGERPRINT ) != fingerprint:
+            return False
+
+        for filename in entry.get( C_FILES, [] ):
+            if not os.path.isfile( os.path.join( self.__folder, filename ) ):
+                return False
+
+        return True
+
+    def exports( self, key ) -> list:
+        # JSON has no tuples, the exports are restored as they were generated
+        return [ tuple( item ) for item in self.__objects.get( key, {} ).get( C_EXPORTS, [] ) ]
+
+    def update( self, key, fingerprint, files: list, exports = None ):
+        entry = { C_FINGERPRINT: fingerprint,
+                  C_FILES: [ os.path.relpath( filename, self.__folder ).replace( os.sep, '/' )
+                             for filename in files ] }
+        if exports is not None:
+            entry[ C_EXPORTS ] = exports
+
+        self.__objects[ key ] = entry
+        self.__updated[ key ] = entry
+        return
+
+    @property
+    def updated( self ) -> dict:
+        return self.__updated
+
+    def merge( self, updated: dict ):
+        self.__objects.update( updated )
+        self.__updated.update( updated )
+        return
+
+    def save( self ):
+        if len( self.__updated ) == 0:
+            return
+
+        writeFile( self.__filename, json.dumps( { C_VERSION: gencrud.version.__version__,
+                                                  C_OBJECTS: self.__objects }, indent = 4, sort_keys = True ) )
+
+        self.__updated = {}
+        return
+
+
+class FileDigests( object ):
+    """The persisted digests of files, by absolute filename.
+
+    Each digest is stored with the size and modification time of the file, a file is only
+    read again when its size or modification time changed.
+    """
+    def __init__( self, filename ):
+        self.__filename = filename
+        self.__files    = {}
+        self.__used     = {}
+        if os.path.isfile( self.__filename ):
+            try:
+                with open( self.__filename, 'r' ) as stream:
+                    data = json.load( stream )
+
+                if data.get( C_VERSION ) == gencrud.version.__version__:
+                    self.__files = data.get( C_FILES, {} )
+
+            except ValueError:
+                logger.warning( "Ignoring invalid file digests {}".format( self.__filename ) )
+
+        return
+
+    def digest( self, filename, stat = None ) -> str:
+        if stat is None:
+            stat = os.stat( filename )
+
+        signature = [ stat.st_size, stat.st_mtime_ns ]
+        entry = self.__files.get( filename )
+        if entry is None or entry[ :2 ] != signature:
+            entry = signature + [ sha256sum( filename ) ]
+            self.__files[ filename ] = entry
+
+        self.__used[ filename ] = entry
+        return entry[ 2 ]
+
+    def update( self, filename, digest ):
+        """Records the digest of a file that was just written with known content."""
+        stat = os.stat( filename )
+        entry = [ stat.st_size, stat.st_mtime_ns, digest ]
+        self.__files[ filename ] = entry
+        self.__used[ filename ] = entry
+        return
+
+    def save( self ):
+        # Only the files of this run are kept, so removed files do not stay in the file
+        writeFile( self.__filename, json.dumps( { C_VERSION: gencrud.version.__version__,
+                                                  C_FILES: self.__used }, indent = 4, sort_keys = True ) )
+        return
@@ -0,0 +1,81 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+import os
+import re
+import hashlib
+import logging
+import gencrud.util.utils
+from gencrud.constants import C_PLATFORM_LINUX
+
+logger = logging.getLogger()
+
+# The generation date in the header of the generated files, this is not a change of the content
+GENERATION_STAMP = re.compile( rb'gencrud: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}' )
+
+
+def renderedText( text: str ) -> str:
+    """Returns the text of a rendered template as it is written to the source file;
+    on Linux each line is terminated by a newline, on the other platforms the lines
+    are joined as they are.
+    """
+    if gencrud.util.utils.get_platform() == C_PLATFORM_LINUX:
+        return text + '\n'
+
+    return text.replace( '\n', '' )
+
+
+def contentDigest( data: bytes ) -> str:
+    return hashlib.sha256( GENERATION_STAMP.sub( b'gencrud:', data ) ).hexdigest()
+
+
+def writeFile( filename: str, text: str, backup: bool = False ) -> bool:
+    """Writes the text to the file, only when the content of the file changes. A different
+    generation date in the header of the file is not seen as a change.
+
+    The file is written in one go to a temporary file that replaces the original file,
+    so that a file watcher never sees a partially written file. The backup is only made
+    when the file is actually changed.
+
+    :returns:   True when the file was written.
+    """
+    data = text.replace( '\n', os.linesep ).encode( 'utf-8' )
+    if os.path.isfile( filename ) and os.path.getsize( filename ) == len( data ):
+        with open( filename, 'rb' ) as stream:
+            if contentDigest( stream.read() ) == contentDigest( data ):
+                logger.debug( "Unchanged {}".format( filename ) )
+                return False
+
+    if backup:
+        gencrud.util.utils.backupFile( filename )
+
+    tempFilename = '{}.{}.tmp'.format( filename, os.getpid() )
+    try:
+        with open( tempFilename, 'wb' ) as stream:
+            stream.write( data )
+
+        os.replace( tempFilename, filename )
+
+    except Exception:
+        if os.path.isfile( tempFilename ):
+            os.remove( tempFilename )
+
+        raise
+
+    logger.debug( "Written {}".format( filename ) )
+    return True
@@ -0,0 +1,127 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+import re
+import logging
+
+logger = logging.getLogger()
+
+# The start of an import statement, not the 'imports:' of a module or a dynamic 'import('
+IMPORT_START    = re.compile( r'import[\s{*]' )
+IMPORT_END      = re.compile( r'''(;|\bfrom\s*(['"])[^'"]*\2)\s*$''' )
+IMPORT_NAMES    = re.compile( r'''^import\s*\{([^}]*)\}\s*from\s*(['"])([^'"]*)\2\s*;?$''', re.DOTALL )
+
+
+def importSpecifiers( statement: str ) -> set:
+    """Returns the set of ( name, path ) that are imported by the statement, or the
+    statement itself when it is not an import of named exports.
+    """
+    statement = ' '.join( statement.split() )
+    match = IMPORT_NAMES.match( statement )
+    if match is None:
+        return { statement.rstrip( ';' ) }
+
+    return { ( name.strip(), match.group( 3 ) ) for name in match.group( 1 ).split( ',' ) if name.strip() != '' }
+
+
+class DocumentPatch( object ):
+    """Collects the edits of the lines of a source file and applies them in one pass.
+
+    The line numbers of the edits are the line numbers of the original lines, so the
+    edits do not need to be made in order and do not influence each other.
+    """
+    def __init__( self, lines: list ):
+        self.__lines    = lines
+        self.__edits    = []
+        self.__imports  = None
+        self.__importEnd = 0
+        return
+
+    def replace( self, start: int, end: int, newLines: list ):
+        """Replaces the lines 'start' up to and including 'end' by 'newLines'."""
+        self.__edits.append( ( start, end + 1, [ line if line.endswith( '\n' ) else line + '\n'
+                                                 for line in newLines ] ) )
+        return
+
+    def insert( self, lineNo: int, newLines: list ):
+        """Inserts 'newLines' before the line 'lineNo'."""
+        self.__edits.append( ( lineNo, lineNo, [ line if line.endswith( '\n' ) else line + '\n'
+                                                 for line in newLines ] ) )
+        return
+
+    def __indexImports( self ):
+        self.__imports = set()
+        statement = None
+        for lineNo, lineText in enumerate( self.__lines ):
+            lineText = lineText.strip()
+            if statement is None:
+                if IMPORT_START.match( lineText ) is None:
+                    continue
+
+                statement = lineText
+
+            else:
+                statement += ' ' + lineText
+
+            if IMPORT_END.search( lineText ) is not None:
+                self.__imports.update( importSpecifiers( statement ) )
+                self.__importEnd = lineNo + 1
+                statement = None
+
+        return
+
+    def hasImport( self, statement: str ) -> bool:
+        if self.__imports is None:
+            self.__indexImports()
+
+        return importSpecifiers( statement ).issubset( self.__imports )
+
+    def addImports( self, statements: list ):
+        """Adds the import statements that are not yet imported after the last import statement."""
+        newLines = []
+        for statement in statements:
+            if not self.hasImport( statement ):
+                logger.debug( "Adding import {}".format( statement ) )
+                newLines.append( statement )
+                self.__imports.update( importSpecifiers( statement ) )
+
+        if len( newLines ) > 0:
+            self.insert( self.__importEnd, newLines )
+
+        return
+
+    def apply( self ) -> list:
+        """Applies the edits to the list of lines and returns it."""
+        if len( self.__edits ) == 0:
+            return self.__lines
+
+        result = []
+        pos = 0
+        for start, end, newLines in sorted( self.__edits, key = lambda edit: ( edit[ 0 ], edit[ 1 ] ) ):
+            if start < pos:
+                raise ValueError( "Overlapping edits at line {}".format( start ) )
+
+            result.extend( self.__lines[ pos : start ] )
+            result.extend( newLines )
+            pos = end
+
+        result.extend( self.__lines[ pos: ] )
+        self.__lines[ : ] = result
+        self.__edits = []
+        self.__imports = None
+        return self.__lines
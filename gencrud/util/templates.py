@@ -0,0 +1,77 @@
+#
+#   Python backend and Angular frontend code generation by gencrud
+#   Copyright (C) 2018-2020 Marc Bertens-Nguyen m.bertens@pe2mbs.nl
+#
+#   This library is free software; you can redistribute it and/or modify
+#   it under the terms of the GNU Library General Public License GPL-2.0-only
+#   as published by the Free Software Foundation.
+#
+#   This library is distributed in the hope that it will be useful, but
+#   WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#   Library General Public License for more details.
+#
+#   You should have received a copy of the GNU Library General Public
+#   License GPL-2.0-only along with this library; if not, write to the
+#   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
+#   Boston, MA 02110-1301 USA
+#
+import os
+import hashlib
+import logging
+from mako.lookup import TemplateLookup
+from mako.template import Template
+import gencrud.version
+import gencrud.util.utils
+
+logger = logging.getLogger()
+
+# One TemplateLookup per template folder, so that each template is compiled only
+# once per run, independent of the number of objects and input files.
+_lookups   = {}
+_snippets  = {}
+
+
+def templateCacheFolder( folder ):
+    """Returns the folder where the compiled template modules of 'folder' are stored,
+    or None when the persistent template cache is disabled.
+    """
+    if gencrud.util.utils.templateCache is None:
+        return None
+
+    key = hashlib.sha256( '{}:{}'.format( gencrud.version.__version__,
+                                          os.path.normcase( folder ) ).encode( 'utf-8' ) ).hexdigest()
+    return os.path.join( gencrud.util.utils.templateCache, key[ :16 ] )
+
+
+def getTemplate( filename ) -> Template:
+    """Returns the compiled template for 'filename'.
+
+    The lookup checks the modification time of the template file on every call,
+    and Mako only recompiles the module when the template is newer than the
+    compiled module in the cache folder.
+    """
+    folder, name = os.path.split( os.path.abspath( filename ) )
+    lookup = _lookups.get( folder )
+    if lookup is None:
+        moduleFolder = templateCacheFolder( folder )
+        logger.debug( "Template lookup for {} using cache {}".format( folder, moduleFolder ) )
+        lookup = TemplateLookup( directories = [ folder ],
+                                 module_directory = moduleFolder,
+                                 filesystem_checks = True )
+        _lookups[ folder ] = lookup
+
+    return lookup.get_template( '/' + name )
+
+
+def getTemplateFromText( text ) -> Template:
+    """Returns the compiled template for a template text, the compiled template
+    is kept in memory for the rest of the run.
+    """
+    key = hashlib.sha256( text.encode( 'utf-8' ) ).hexdigest()
+    template = _snippets.get( key )
+    if template is None:
+        template = Template( text )
+        _snippets[ key ] = template
+
+    return template
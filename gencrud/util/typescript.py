@@ -16,16 +16,337 @@
 #   Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor,
 #   Boston, MA 02110-1301 USA
 #
+import re
 import json
 import unittest
 from gencrud.util.exceptions import TypeScriptFormatError, TypeScriptInvalidStartDataType
 
 
+TOKEN_SPACE     = 'space'
+TOKEN_COMMENT   = 'comment'
+TOKEN_STRING    = 'string'
+TOKEN_TEMPLATE  = 'template'
+TOKEN_PUNCT     = 'punct'
+TOKEN_WORD      = 'word'
+
+# Every character of the source is part of exactly one token, a word is everything up to the
+# next white space, punctuation, string or comment. A template string is only started here,
+# its end is found by scanTemplate().
+TOKENS = re.compile( r"""(?P<space>\s+)
+                        |(?P<comment>//[^\n]*|/\*.*?\*/)
+                        |(?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+                        |(?P<template>`)
+                        |(?P<punct>[{}\[\](),:])
+                        |(?P<word>(?:[^\s{}\[\](),:'"`/]|/(?![/*]))+)""", re.VERBOSE | re.DOTALL )
+TEMPLATE_TEXT = re.compile( r'[^`\\$]+|\\.|\$(?!\{)', re.DOTALL )
+OPEN_CLOSE = { '{': '}', '[': ']', '(': ')' }
+
+
+def position( text, pos ) -> tuple:
+    """Returns the line and column of the position in the text, both start at 1."""
+    return text.count( '\n', 0, pos ) + 1, pos - text.rfind( '\n', 0, pos )
+
+
+def formatError( text, pos ) -> TypeScriptFormatError:
+    symbol = text[ pos ] if pos < len( text ) else 'end of text'
+    return TypeScriptFormatError( symbol, *position( text, pos ) )
+
+
+def scanTemplate( text, pos ) -> int:
+    """Returns the end position of the template string that starts before 'pos',
+    including the expressions in the template string.
+    """
+    while pos < len( text ):
+        if text[ pos ] == '`':
+            return pos + 1
+
+        if text.startswith( '${', pos ):
+            depth = 0
+            for kind, start, end in tokenize( text, pos + 2 ):
+                if kind == TOKEN_PUNCT and text[ start ] == '{':
+                    depth += 1
+
+                elif kind == TOKEN_PUNCT and text[ start ] == '}':
+                    if depth == 0:
+                        pos = end
+                        break
+
+                    depth -= 1
+
+            else:
+                raise formatError( text, len( text ) )
+
+            continue
+
+        match = TEMPLATE_TEXT.match( text, pos )
+        if match is None:
+            raise formatError( text, pos )
+
+        pos = match.end()
+
+    raise formatError( text, pos )
+
+
+def tokenize( text, pos = 0 ):
+    """Yields the tokens of the text as ( kind, start, end ), joining the text of all
+    tokens gives back the original text.
+    """
+    while pos < len( text ):
+        match = TOKENS.match( text, pos )
+        if match is None:
+            raise formatError( text, pos )
+
+        kind = match.lastgroup
+        end = match.end()
+        if kind == TOKEN_TEMPLATE:
+            end = scanTemplate( text, end )
+
+        yield kind, pos, end
+        pos = end
+
+    return
+
+
+class TsNode( object ):
+    """Node of the syntax tree, 'start' and 'end' are the position of the node in the source."""
+    def __init__( self, source, start, end ):
+        self.source = source
+        self.start  = start
+        self.end    = end
+        return
+
+    @property
+    def text( self ) -> str:
+        return self.source[ self.start : self.end ]
+
+    def value( self ):
+        return self.text
+
+
+class TsArray( TsNode ):
+    def __init__( self, source, start, end, items ):
+        TsNode.__init__( self, source, start, end )
+        self.items = items
+        return
+
+    def value( self ):
+        return [ item.value() for item in self.items ]
+
+
+class TsObject( TsNode ):
+    def __init__( self, source, start, end, properties ):
+        TsNode.__init__( self, source, start, end )
+        # List of ( key, node ), the key is the source text of the key
+        self.properties = properties
+        return
+
+    def get( self, key ):
+        for name, node in self.properties:
+            if name == key:
+                return node
+
+        return None
+
+    def value( self ):
+        return { key: node.value() for key, node in self.properties }
+
+
+def _isPunct( text, token, chars ) -> bool:
+    return token[ 0 ] == TOKEN_PUNCT and text[ token[ 1 ] ] in chars
+
+
+def _parseValue( text, tokens, idx ) -> tuple:
+    if idx >= len( tokens ):
+        raise formatError( text, len( text ) )
+
+    if _isPunct( text, tokens[ idx ], '{' ):
+        return _parseObject( text, tokens, idx )
+
+    if _isPunct( text, tokens[ idx ], '[' ):
+        return _parseArray( text, tokens, idx )
+
+    # Any other value is an expression, up to the next comma or closing bracket
+    # that is not nested within the expression.
+    first = idx
+    nested = []
+    while idx < len( tokens ):
+        token = tokens[ idx ]
+        if token[ 0 ] == TOKEN_PUNCT:
+            char = text[ token[ 1 ] ]
+            if char in OPEN_CLOSE:
+                nested.append( OPEN_CLOSE[ char ] )
+
+            elif len( nested ) == 0 and char in ',:}])':
+                break
+
+            elif char in '}])':
+                if nested.pop() != char:
+                    raise formatError( text, token[ 1 ] )
+
+        idx += 1
+
+    if len( nested ) > 0 or idx == first:
+        raise formatError( text, len( text ) if idx >= len( tokens ) else tokens[ idx ][ 1 ] )
+
+    return TsNode( text, tokens[ first ][ 1 ], tokens[ idx - 1 ][ 2 ] ), idx
+
+
+def _parseObject( text, tokens, idx ) -> tuple:
+    start = tokens[ idx ][ 1 ]
+    properties = []
+    idx += 1
+    while idx < len( tokens ) and not _isPunct( text, tokens[ idx ], '}' ):
+        kind, keyStart, keyEnd = tokens[ idx ]
+        if kind not in ( TOKEN_WORD, TOKEN_STRING ):
+            raise formatError( text, keyStart )
+
+        key = text[ keyStart : keyEnd ]
+        idx += 1
+        if idx < len( tokens ) and _isPunct( text, tokens[ idx ], ':' ):
+            node, idx = _parseValue( text, tokens, idx + 1 )
+
+        else:
+            # Shorthand property
+            node = TsNode( text, keyStart, keyEnd )
+
+        properties.append( ( key, node ) )
+        if idx < len( tokens ) and _isPunct( text, tokens[ idx ], ',' ):
+            idx += 1
+
+        elif idx < len( tokens ) and not _isPunct( text, tokens[ idx ], '}' ):
+            raise formatError( text, tokens[ idx ][ 1 ] )
+
+    if idx >= len( tokens ):
+        raise formatError( text, len( text ) )
+
+    return TsObject( text, start, tokens[ idx ][ 2 ], properties ), idx + 1
+
+
+def _parseArray( text, tokens, idx ) -> tuple:
+    start = tokens[ idx ][ 1 ]
+    items = []
+    idx += 1
+    while idx < len( tokens ) and not _isPunct( text, tokens[ idx ], ']' ):
+        node, idx = _parseValue( text, tokens, idx )
+        items.append( node )
+        if idx < len( tokens ) and _isPunct( text, tokens[ idx ], ',' ):
+            idx += 1
+
+        elif idx < len( tokens ) and not _isPunct( text, tokens[ idx ], ']' ):
+            raise formatError( text, tokens[ idx ][ 1 ] )
+
+    if idx >= len( tokens ):
+        raise formatError( text, len( text ) )
+
+    return TsArray( text, start, tokens[ idx ][ 2 ], items ), idx + 1
+
+
+def applyEdits( text, edits ) -> str:
+    """Applies the edits ( start, end, replacement ) to the text, the positions of the edits
+    are the positions in the original text. Insertions at the same position are applied in the
+    order of the edits.
+    """
+    result = []
+    pos = 0
+    for start, end, replacement in sorted( edits, key = lambda edit: ( edit[ 0 ], edit[ 1 ] ) ):
+        if start < pos:
+            raise ValueError( "Overlapping edits at position {}".format( start ) )
+
+        result.append( text[ pos : start ] )
+        result.append( replacement )
+        pos = end
+
+    result.append( text[ pos: ] )
+    return ''.join( result )
+
+
+class TsArrayEditor( object ):
+    """Edits the items of a TsArray like a list, only the changed items are written to the
+    source text. The untouched items, their comments and the layout of the array are kept as
+    they are, new items follow the indentation of the item next to them.
+    """
+    def __init__( self, node: TsArray ):
+        self.__node     = node
+        self.__items    = list( node.items )
+        self.__replaced = {}
+        return
+
+    def __len__( self ):
+        return len( self.__items )
+
+    def values( self ) -> list:
+        """Returns the items as values, the new items as their text."""
+        return [ item if isinstance( item, str ) else self.__replaced.get( id( item ), item.value() )
+                 for item in self.__items ]
+
+    def insert( self, index, text ):
+        self.__items.insert( index, text )
+        return
+
+    def replace( self, index, text ):
+        item = self.__items[ index ]
+        if isinstance( item, str ):
+            self.__items[ index ] = text
+
+        else:
+            self.__replaced[ id( item ) ] = text
+
+        return
+
+    def __linePrefix( self, node ) -> str:
+        source = self.__node.source
+        prefix = source[ source.rfind( '\n', 0, node.start ) + 1 : node.start ]
+        return prefix if prefix.strip() == '' and source.rfind( '\n', self.__node.start, node.start ) >= 0 else None
+
+    def __separator( self, node ) -> str:
+        prefix = self.__linePrefix( node )
+        return ', ' if prefix is None else ',\n' + prefix
+
+    def __indent( self, text, node ) -> str:
+        prefix = self.__linePrefix( node ) or ''
+        return text.replace( '\n', '\n' + prefix )
+
+    def edits( self ) -> list:
+        """Returns the edits ( start, end, replacement ) of the source text."""
+        result = []
+        pending = []
+        last = None
+        for item in self.__items:
+            if isinstance( item, str ):
+                pending.append( item )
+                continue
+
+            if len( pending ) > 0:
+                result.append( ( item.start, item.start, ''.join( self.__indent( text, item ) + self.__separator( item )
+                                                                  for text in pending ) ) )
+                pending = []
+
+            if id( item ) in self.__replaced:
+                result.append( ( item.start, item.end, self.__indent( self.__replaced[ id( item ) ], item ) ) )
+
+            last = item
+
+        if len( pending ) > 0:
+            if last is not None:
+                result.append( ( last.end, last.end, ''.join( self.__separator( last ) + self.__indent( text, last )
+                                                              for text in pending ) ) )
+
+            else:
+                node = self.__node
+                inner = node.source[ node.start + 1 : node.end - 1 ]
+                if inner.strip() == '':
+                    result.append( ( node.start + 1, node.end - 1, ' {} '.format( ', '.join( pending ) ) ) )
+
+                else:
+                    # Only comments in the array
+                    result.append( ( node.end - 1, node.end - 1, '{} '.format( ', '.join( pending ) ) ) )
+
+        return result
+
+
 class TypeScript( object ):
     def __init__( self ):
         self.__indent = 0
-        self.__line = 1
-        self.__column = 1
         return
 
     def _buildDict( self, obj, indent ):
@@ -99,133 +420,22 @@ class TypeScript( object ):
 
         raise TypeScriptInvalidStartDataType( repr( obj ) )
 
-    def __skipWhiteSpace( self, text, idx ):
-        while idx < len( text ) and text[ idx ] in ( ' ', '\t', '\n', '\r' ):
-            if text[ idx ] == '\n':
-                self.__line += 1
-                self.__column = 1
+    def parseTree( self, text ) -> TsNode:
+        """Parses the TypeScript object or array literal in 'text' into a syntax tree,
+        each node of the tree holds its exact position in the source text.
+        """
+        if type( text ) in ( tuple, list ):
+            text = '\n'.join( text )
 
-            idx += 1
-
-        return idx
-
-    def _parseDict( self, text, idx ):
-        result = {}
-        idx = self.__skipWhiteSpace( text, idx )
-        while idx < len( text ) and text[ idx ] != '}':
-            idx = self.__skipWhiteSpace( text, idx )
-            key, idx = self._parse( text, idx )
-            idx = self.__skipWhiteSpace( text, idx )
-            if text[ idx ] == ':':
-                idx += 1
-                self.__column += 1
-                result[ key ], idx = self._parse( text, idx )
-                if text[ idx ] == '}':
-                    continue
-
-                idx += 1
-                self.__column += 1
-            elif text[ idx ] == '}':
-                break
-
-            elif text[ idx ] == ',':    # special case after reading constant strings single or double qouted
-                idx += 1
-                self.__column += 1
-                continue
-
-            elif text[ idx ] == ',':
-                # next element
-                print( 'next element: {}'.format( key ) )
-                raise TypeScriptFormatError( text[ idx ], self.__line, self.__column )
-
-            else:
-                # format errror
-                raise TypeScriptFormatError( text[ idx ], self.__line, self.__column )
-
-        idx += 1
-        self.__column += 1
-        return result, idx
-
-    def _parseArray( self, text, idx ):
-        result = []
-        idx = self.__skipWhiteSpace( text, idx )
-        while idx < len( text ) and text[ idx ] != ']':
-            item, idx = self._parse( text, idx )
-            result.append( item )
-            if text[ idx ] == ']':
-                continue
-
-            idx += 1
-            self.__column += 1
-            idx = self.__skipWhiteSpace( text, idx )
-
-        idx += 1
-        self.__column += 1
-        return result, idx
-
-    def _parse( self, text, idx ):
-        idx = self.__skipWhiteSpace( text, idx )
-
-        def copyUntil( copyIdx, until ):
-            result = ''
-            while copyIdx < len( text ) and text[ copyIdx ] not in until:
-                if text[ idx ] == '//':
-                    result += text[ copyIdx ]
-                    self.__column += 1
-                    copyIdx += 1
-                    result += text[ copyIdx ]
-                    self.__column += 1
-                    copyIdx += 1
-
-                else:
-                    result += text[ copyIdx ]
-                    self.__column += 1
-                    copyIdx += 1
-
-            copyIdx = self.__skipWhiteSpace( text, copyIdx )
-            return result, copyIdx
-
-        if text[ idx ] == '{':
-            # dict
-            idx += 1
-            self.__column += 1
-            obj, idx = self._parseDict( text, idx )
-
-        elif text[ idx ] == '[':
-            # array
-            idx += 1
-            self.__column += 1
-            obj, idx = self._parseArray( text, idx )
-
-        elif text[ idx ] == "'":    # Constant string single quote
-            idx += 1
-            self.__column += 1
-            obj, idx = copyUntil( idx, "'" )
-            obj = "'{0}'".format( obj )
-
-        elif text[ idx ] == '"':    # Constant string double quote
-            idx += 1
-            self.__column += 1
-            obj, idx = copyUntil( idx, '"' )
-            obj = '"{0}"'.format( obj )
-
-        else:
-            obj, idx = copyUntil( idx, ',{}[]: \t\n\r' )
-
-        return obj, idx
+        tokens = [ token for token in tokenize( text ) if token[ 0 ] not in ( TOKEN_SPACE, TOKEN_COMMENT ) ]
+        node, _ = _parseValue( text, tokens, 0 )
+        return node
 
     def parse( self, text ):
-        self.__line = 1
-        self.__column = 1
-        try:
-            if type( text ) in ( tuple, list ):
-                return self._parse( '\n'.join( text ), 0 )[ 0 ]
-
-            return self._parse( text, 0 )[ 0 ]
-
-        except Exception:
-            print( text )
-            raise
+        """Parses the TypeScript object or array literal in 'text' into dictionaries and lists,
+        all other values are kept as their source text.
+        """
+        return self.parseTree( text ).value()
 
 
 class MyTest( unittest.TestCase ):
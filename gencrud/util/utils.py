@@ -31,6 +31,9 @@ useModule       = False
 lazyLoading     = False
 version         = 1
 config          = None
+templateCache   = os.path.join( os.path.expanduser( '~' ), '.gencrud', 'cache' )
+incremental     = False
+linkCommon      = False
 
 C_FILEMODE_UPDATE = 'r+'
 C_FILEMODE_WRITE  = 'w'
@@ -91,22 +94,13 @@ def findImportSection( lines ):
 
 
 def insertLinesUnique( lines, rangeObj, line ):
-    found = False
     logger.debug( "insertLinesUnique from line {} to line {}".format( rangeObj.start, rangeObj.end ) )
-
     end = rangeObj.end
     if end + 1 < len( lines ):
         end += 1
 
-    for idx in range( rangeObj.start, end ):
-        logger.debug( "Check line {} of {} => '{}'".format( idx, rangeObj.end, lines[ idx ].strip( '\r\n') ) )
-
-        if line in lines[ idx ].strip( '\n' ):
-            found = True
-
-    if not found:
+    if not any( line in text for text in lines[ rangeObj.start : end ] ):
         logger.debug( 'inject files [{0}] @ {1}'.format( line, rangeObj.end ) )
-
         lines.insert( rangeObj.end + 1, line + '\n' )
         rangeObj.end += 1
 
@@ -128,40 +122,10 @@ def searchSection( lines, rangeObj, sectionStart, sectionEnd ):
 
 
 def replaceInList( lines, range_obj, to_replace ):
-    lineNo = range_obj.start
-    for i in range_obj.range():
-        del lines[ lineNo ]
-
-    del lines[ lineNo ]
-    for line in to_replace:
-        if not line.endswith( '\n' ):
-            line += '\n'
-
-        lines.insert( lineNo, line )
-        lineNo += 1
-
+    lines[ range_obj.start : range_obj.end + 1 ] = [ line if line.endswith( '\n' ) else line + '\n'
+                                                     for line in to_replace ]
     return
 
 
 def sourceName( templateName ):
     return os.path.splitext( os.path.basename( templateName ) )[ 0 ]
-
-
-def check_nltk():
-    try:
-        from nltk.tokenize import word_tokenize
-        word_tokenize( 'It\'s.' )
-
-    except Exception:
-        from nltk import download
-        if not sslVerify:
-            from ssl import _create_unverified_context
-            from six.moves.urllib.request import install_opener, HTTPSHandler, build_opener
-            # TODO: This needs still proxy support !
-            ctx = _create_unverified_context()
-            opener = build_opener( HTTPSHandler( context = ctx ) )
-            install_opener( opener )
-
-        download( 'punkt' )
-
-    return
@@ -156,7 +156,6 @@ setup(
     # For an analysis of "install_requires" vs pip's requirements files see:
     # https://packaging.python.org/en/latest/requirements.html
     install_requires = [ 'mako',
-                         'nltk',
                          'pyyaml',
                          'six' ],  # Optional
 
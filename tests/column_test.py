@@ -0,0 +1,50 @@
+from gencrud.config.column import parseField, TemplateColumn
+from gencrud.util.exceptions import InvalidFieldDefinition
+import pytest
+
+
+def test_parse_field():
+    assert parseField('WA_ROLES', 'D_ROLE_ID       INT         AUTO NUMBER  PRIMARY KEY',
+                      TemplateColumn.TS_TYPES_FROM_SQL) == ('D_ROLE_ID', 'INT', 0, ['AUTO NUMBER', 'PRIMARY KEY'])
+    assert parseField('WA_ROLES', 'D_ROLE CHAR( 20 ) NOT NULL DEFAULT \'none\'',
+                      TemplateColumn.TS_TYPES_FROM_SQL) == ('D_ROLE', 'CHAR', 20, ['NOT NULL', "DEFAULT 'none'"])
+    assert parseField('WA_USERS', 'U_ROLE INT FOREIGN KEY WA_ROLES.D_ROLE_ID NULL',
+                      TemplateColumn.TS_TYPES_FROM_SQL) == ('U_ROLE', 'INT', 0,
+                                                            ['FOREIGN KEY WA_ROLES.D_ROLE_ID', 'NULL'])
+    assert parseField('WA_USERS', 'U_NAME CHAR(20) NOT NULL INDEX',
+                      TemplateColumn.TS_TYPES_FROM_SQL) == ('U_NAME', 'CHAR', 20, ['NOT NULL', 'INDEX'])
+
+
+def test_parse_field_error():
+    with pytest.raises(InvalidFieldDefinition) as exc:
+        parseField('WA_ROLES', 'D_ROLE CHAR(20) NOT NUL', TemplateColumn.TS_TYPES_FROM_SQL)
+
+    assert 'position 21' in str(exc.value)
+
+
+def test_parse_field_trailing_whitespace():
+    assert parseField('WA_ROLES', 'D_ID INT ', TemplateColumn.TS_TYPES_FROM_SQL) == ('D_ID', 'INT', 0, [])
+    assert parseField('WA_ROLES', 'D_ID INT PRIMARY KEY  ',
+                      TemplateColumn.TS_TYPES_FROM_SQL) == ('D_ID', 'INT', 0, ['PRIMARY KEY'])
+
+
+def test_parse_field_unterminated_string():
+    with pytest.raises(InvalidFieldDefinition) as exc:
+        parseField('WA_ROLES', "D_ROLE CHAR(20) DEFAULT 'none ", TemplateColumn.TS_TYPES_FROM_SQL)
+
+    assert 'unterminated string' in str(exc.value)
+
+
+def test_quoted_default(monkeypatch):
+    from types import SimpleNamespace
+    import gencrud.util.utils
+    monkeypatch.setattr(gencrud.util.utils, 'config',
+                        SimpleNamespace(options=SimpleNamespace(ignoreCaseDbIds=False)), raising=False)
+    assert parseField('T', "A CHAR(20) DEFAULT 'a b' INDEX",
+                      TemplateColumn.TS_TYPES_FROM_SQL) == ('A', 'CHAR', 20, ["DEFAULT 'a b'", 'INDEX'])
+    column = TemplateColumn(None, 'T', field="A CHAR(20) DEFAULT 'a b' INDEX")
+    assert column.sqlAlchemyDef() == 'API.db.Column( API.db.String( 20 ), default = "a b", index = True )'
+    column = TemplateColumn(None, 'T', field='A CHAR(20) DEFAULT \'say "hi"\'')
+    assert column.sqlAlchemyDef() == 'API.db.Column( API.db.String( 20 ), default = "say \\"hi\\"" )'
+    column = TemplateColumn(None, 'T', field='A CHAR(20) DEFAULT none')
+    assert column.sqlAlchemyDef() == 'API.db.Column( API.db.String( 20 ), default = "none" )'
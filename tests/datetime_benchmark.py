@@ -0,0 +1,82 @@
+"""Micro-benchmark of convertDateTime() of the generated datetimes.py.
+
+Compares the parser with the previous strptime() based implementation on a mix of the
+timestamp formats that the frontend sends, run it from the root of the gencrud source
+tree:
+
+    python tests/datetime_benchmark.py [count]
+"""
+import os
+import sys
+import time
+import datetime
+import importlib.util
+
+SAMPLES = [
+    '2021-03-04T05:06:07.890Z',
+    '2021-03-04T05:06:07.890+01:00',
+    '2021-03-04T05:06:07-05:00',
+    '2021-03-04 05:06:07',
+    'Thu Mar 04 2021 05:06:07 GMT+0100 (Central European Standard Time)',
+]
+
+
+def load_datetimes():
+    filename = os.path.join(os.path.dirname(__file__), '..', 'gencrud', 'templates', 'common', 'python',
+                            'datetimes.py')
+    spec = importlib.util.spec_from_file_location('datetimes', filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_convert_datetime(value):
+    value = value[0:22] + value[23:]
+    if value.startswith('0000-00-00'):
+        value = datetime.datetime.utcnow()
+
+    elif not value[0].isdigit():
+        value = value.split('(')[0].strip()
+        try:
+            value = datetime.datetime.strptime(value, '%a %b %d %Y %H:%M:%S %Z%z')
+
+        except Exception:
+            value = datetime.datetime.strptime(value, '%a %b %d %Y %H:%M:%S %z%Z')
+
+    elif value.endswith('Z'):
+        value = datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%fZ')
+
+    elif 'T' in value:
+        if '+' in value:
+            value = datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+        else:
+            value = datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+
+    else:
+        value = datetime.datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+    return value
+
+
+def measure(function, values):
+    start = time.perf_counter()
+    for value in values:
+        function(value)
+
+    return time.perf_counter() - start
+
+
+def main(count):
+    values = [SAMPLES[index % len(SAMPLES)] for index in range(count)]
+    convert_datetime = load_datetimes().convertDateTime
+    legacy = measure(legacy_convert_datetime, values)
+    current = measure(convert_datetime, values)
+    print('{:,} timestamps'.format(count))
+    print('strptime     {:8.3f} s'.format(legacy))
+    print('fromisoformat {:7.3f} s'.format(current))
+    print('speedup      {:8.1f}x'.format(legacy / current))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,54 @@
+import datetime
+from types import SimpleNamespace
+from dateutil import parser
+from .datetime_benchmark import SAMPLES, load_datetimes, legacy_convert_datetime
+import pytest
+
+datetimes = load_datetimes()
+
+ISO_SAMPLES = [
+    '2021-03-04T05:06:07.890+01:00',
+    '2021-03-04T05:06:07.123456-05:30',
+    '2021-03-04T05:06:07+02:00',
+    '2021-03-04T05:06:07',
+    '2021-03-04 05:06:07',
+    '2021-03-04T05:06',
+]
+
+
+@pytest.mark.parametrize('value', SAMPLES)
+def test_convert_datetime_legacy(value):
+    assert datetimes.convertDateTime(value) == legacy_convert_datetime(value)
+
+
+@pytest.mark.parametrize('value', ISO_SAMPLES)
+def test_parse_iso_datetime(value):
+    result = datetimes.parseIsoDateTime(value)
+    expected = parser.isoparse(value)
+    assert result == expected
+    assert result.utcoffset() == expected.utcoffset()
+
+
+def test_convert_datetime_utc_and_javascript():
+    assert datetimes.convertDateTime('2021-03-04T05:06:07.890Z') == parser.isoparse('2021-03-04T05:06:07.890')
+    result = datetimes.convertDateTime('Thu Mar 04 2021 05:06:07 GMT+0100 (Central European Standard Time)')
+    assert result == parser.isoparse('2021-03-04T05:06:07+01:00')
+    assert result.utcoffset() == parser.isoparse('2021-03-04T05:06:07+01:00').utcoffset()
+
+
+def test_parse_iso_datetime_invalid():
+    with pytest.raises(ValueError):
+        datetimes.parseIsoDateTime('04-03-2021 05:06')
+
+
+
+@pytest.mark.parametrize('value', ISO_SAMPLES)
+def test_parse_iso_datetime_without_fromisoformat(value, monkeypatch):
+    # Python 3.6 has no datetime.fromisoformat(), the regular expression is used instead
+    def python36_datetime(*args):
+        return datetime.datetime(*args)
+
+    monkeypatch.setattr(datetimes, 'datetime', SimpleNamespace(datetime=python36_datetime,
+                                                               timezone=datetime.timezone,
+                                                               timedelta=datetime.timedelta))
+    assert datetimes.parseIsoDateTime(value) == parser.isoparse(value)
@@ -0,0 +1,29 @@
+from gencrud.configuraton import my_safe_load
+from gencrud.util.exceptions import IncludeCycle
+import os
+import pytest
+
+
+def load(filename):
+    with open(str(filename)) as stream:
+        return my_safe_load(stream)
+
+
+def test_include_cache(tmp_path):
+    (tmp_path / 'columns.yaml').write_text('- field: A INT\n')
+    (tmp_path / 'main.yaml').write_text('first: !include ./columns.yaml\nsecond: !include ./columns.yaml\n')
+    data = load(tmp_path / 'main.yaml')
+    assert data['first'] == data['second'] == [{'field': 'A INT'}]
+    assert data['first'] is not data['second']
+
+    (tmp_path / 'columns.yaml').write_text('- field: B INT\n')
+    mtime = os.path.getmtime(str(tmp_path / 'columns.yaml')) + 10
+    os.utime(str(tmp_path / 'columns.yaml'), (mtime, mtime))
+    assert load(tmp_path / 'main.yaml')['first'] == [{'field': 'B INT'}]
+
+
+def test_include_cycle(tmp_path):
+    (tmp_path / 'first.yaml').write_text('second: !include ./second.yaml\n')
+    (tmp_path / 'second.yaml').write_text('first: !include ./first.yaml\n')
+    with pytest.raises(IncludeCycle):
+        load(tmp_path / 'first.yaml')
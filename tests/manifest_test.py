@@ -0,0 +1,75 @@
+from gencrud.configuraton import TemplateConfiguration
+from gencrud.util.manifest import Manifest, FileDigests
+from .schema_test import normal_template_config
+import os
+
+
+def templateFiles(name):
+    folder = os.path.join(os.getcwd(), 'gencrud', 'templates', name)
+    return [os.path.join(folder, filename) for filename in os.listdir(folder)]
+
+
+def test_manifest_unchanged(normal_template_config: TemplateConfiguration, tmp_path):
+    cfg = normal_template_config.objects[0]
+    key = Manifest.key(normal_template_config, cfg)
+    templates = templateFiles('angular')
+    fingerprint = Manifest.fingerprint(normal_template_config, cfg, templates)
+    assert fingerprint == Manifest.fingerprint(normal_template_config, cfg, templates)
+
+    output = tmp_path / 'model.ts'
+    output.write_text('')
+    manifest = Manifest(str(tmp_path))
+    manifest.update(key, fingerprint, [str(output)], [('app', cfg.name, 'model.ts', ['class', 'Model'])])
+    manifest.save()
+
+    manifest = Manifest(str(tmp_path))
+    assert manifest.unchanged(key, fingerprint)
+    assert not manifest.unchanged(key, 'other')
+    assert manifest.exports(key) == [('app', cfg.name, 'model.ts', ['class', 'Model'])]
+
+    os.remove(str(output))
+    assert not manifest.unchanged(key, fingerprint)
+
+
+def test_manifest_fingerprint_templates(normal_template_config: TemplateConfiguration):
+    cfg = normal_template_config.objects[0]
+    assert Manifest.fingerprint(normal_template_config, cfg, templateFiles('angular')) != \
+        Manifest.fingerprint(normal_template_config, cfg, templateFiles('python'))
+
+
+def test_file_digests(tmp_path, monkeypatch):
+    import gencrud.util.manifest
+    source = tmp_path / 'source.ts'
+    source.write_text('export class A {}')
+    digests = FileDigests(str(tmp_path / 'digests.json'))
+    digest = digests.digest(str(source))
+    digests.save()
+
+    def noHash(filename):
+        raise AssertionError('{} hashed again'.format(filename))
+
+    monkeypatch.setattr(gencrud.util.manifest, 'sha256sum', noHash)
+    digests = FileDigests(str(tmp_path / 'digests.json'))
+    assert digests.digest(str(source)) == digest
+
+    monkeypatch.undo()
+    source.write_text('export class Other {}')
+    assert digests.digest(str(source)) != digest
+
+
+def test_copy_python_common(tmp_path):
+    from types import SimpleNamespace
+    from gencrud.generators.python import copyPythonCommon
+    common = os.path.join(os.getcwd(), 'gencrud', 'templates', 'common', 'python')
+    application = tmp_path / 'testapp'
+    application.mkdir()
+    (application / 'common.py').write_text('# old common')
+    (application / 'main.py').write_text('# project main')
+    config = SimpleNamespace(application='testapp',
+                             python=SimpleNamespace(sourceFolder=str(tmp_path), commonFolder=common))
+    copyPythonCommon(config)
+    with open(os.path.join(common, 'common.py')) as stream:
+        assert (application / 'common.py').read_text() == stream.read()
+
+    assert (application / 'sqlfilter.py').is_file()
+    assert (application / 'main.py').read_text() == '# project main'
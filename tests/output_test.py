@@ -0,0 +1,19 @@
+from gencrud.util.output import writeFile
+import os
+
+
+def test_write_file_changed(tmp_path):
+    filename = str(tmp_path / 'model.ts')
+    assert writeFile(filename, '// gencrud: 2020-01-01 10:00:00 version 1\nexport class Model {}\n')
+    mtime = os.path.getmtime(filename)
+    assert not writeFile(filename, '// gencrud: 2020-01-01 10:00:00 version 1\nexport class Model {}\n', True)
+    assert not writeFile(filename, '// gencrud: 2021-02-02 12:34:56 version 1\nexport class Model {}\n', True)
+    assert os.path.getmtime(filename) == mtime
+    assert not os.path.isfile(filename + '.~1')
+
+    assert writeFile(filename, '// gencrud: 2021-02-02 12:34:56 version 1\nexport class Other {}\n', True)
+    assert os.path.isfile(filename + '.~1')
+    with open(filename) as stream:
+        assert 'Other' in stream.read()
+
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
@@ -0,0 +1,37 @@
+from gencrud.util.patch import DocumentPatch
+
+APP_MODULE = """import { NgModule } from '@angular/core';
+import {
+    FormsModule,
+    ReactiveFormsModule
+} from '@angular/forms';
+
+@NgModule({
+  imports: [
+    FormsModule
+  ]
+})
+export class AppModule { }
+"""
+
+
+def test_patch_imports_and_section():
+    lines = APP_MODULE.splitlines(True)
+    patch = DocumentPatch(lines)
+    patch.replace(6, 10, ['@NgModule({', '  imports: [ FormsModule, RoleModule ]', '})'])
+    patch.addImports(["import { ReactiveFormsModule } from '@angular/forms';",
+                      "import { RoleModule } from './role/module';",
+                      "import { RoleModule } from './role/module';"])
+    assert patch.apply() is lines
+    assert ''.join(lines) == """import { NgModule } from '@angular/core';
+import {
+    FormsModule,
+    ReactiveFormsModule
+} from '@angular/forms';
+import { RoleModule } from './role/module';
+
+@NgModule({
+  imports: [ FormsModule, RoleModule ]
+})
+export class AppModule { }
+"""
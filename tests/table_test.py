@@ -0,0 +1,19 @@
+from gencrud.config.table import TemplateIndex
+from gencrud.util.exceptions import InvalidSetting
+import pytest
+
+
+def test_index_definition():
+    index = TemplateIndex(None, 'IX_ROLE', 'D_ROLE_NAME, D_ROLE_ID DESC')
+    assert index.columns == [('D_ROLE_NAME', False), ('D_ROLE_ID', True)]
+    assert index.sqlAlchemyDef('Role') == "API.db.Index( 'IX_ROLE', Role.D_ROLE_NAME, Role.D_ROLE_ID.desc() )"
+
+    index = TemplateIndex(None, 'IX_ACTIVE', {'columns': ['D_ROLE_NAME'], 'unique': True, 'where': 'd_active = 1'})
+    assert index.sqlAlchemyDef('Role') == ("API.db.Index( 'IX_ACTIVE', Role.D_ROLE_NAME, unique = True, "
+                                           "postgresql_where = API.db.text( 'd_active = 1' ), "
+                                           "sqlite_where = API.db.text( 'd_active = 1' ) )")
+
+
+def test_index_invalid_column():
+    with pytest.raises(InvalidSetting):
+        TemplateIndex(None, 'IX_ROLE', 'D_ROLE_NAME ASCENDING')
@@ -0,0 +1,105 @@
+from gencrud.util.typescript import TypeScript, TsArrayEditor, applyEdits, tokenize
+from gencrud.util.exceptions import TypeScriptFormatError
+import pytest
+
+NG_MODULE = """{
+    // The components of the application
+    declarations: [
+        AppComponent, /* generated */ RoleTableComponent,
+    ],
+    imports: [ RouterModule.forRoot( appRoutes, { useHash: true } ), `${ base }/api//role` ],
+    providers: [ { provide: HTTP_INTERCEPTORS, useClass: Interceptor, multi: true } ],
+    bootstrap: [ 'http://localhost//app' ]
+}"""
+
+
+def test_tokenize_round_trip():
+    assert ''.join(NG_MODULE[start:end] for _, start, end in tokenize(NG_MODULE)) == NG_MODULE
+
+
+def test_parse_ng_module():
+    assert TypeScript().parse(NG_MODULE) == {
+        'declarations': ['AppComponent', 'RoleTableComponent'],
+        'imports': ['RouterModule.forRoot( appRoutes, { useHash: true } )', '`${ base }/api//role`'],
+        'providers': [{'provide': 'HTTP_INTERCEPTORS', 'useClass': 'Interceptor', 'multi': 'true'}],
+        'bootstrap': ["'http://localhost//app'"]
+    }
+
+
+def test_parse_tree_source():
+    tree = TypeScript().parseTree(NG_MODULE)
+    assert tree.text == NG_MODULE
+    assert tree.get('providers').text == '[ { provide: HTTP_INTERCEPTORS, useClass: Interceptor, multi: true } ]'
+    assert tree.get('declarations').items[1].text == 'RoleTableComponent'
+
+
+def test_parse_error():
+    with pytest.raises(TypeScriptFormatError) as exc:
+        TypeScript().parse('{\n  imports: [ A, B }')
+
+    assert 'line 2 column 19' in str(exc.value)
+
+
+def test_array_editor():
+    source = '[\n    A, // first\n    B\n]'
+    editor = TsArrayEditor(TypeScript().parseTree(source))
+    editor.insert(-1, 'C')
+    editor.insert(len(editor), 'D')
+    assert editor.values() == ['A', 'C', 'B', 'D']
+    assert applyEdits(source, editor.edits()) == '[\n    A, // first\n    C,\n    B,\n    D\n]'
+
+    editor = TsArrayEditor(TypeScript().parseTree('[]'))
+    editor.insert(-1, 'A')
+    assert applyEdits('[]', editor.edits()) == '[ A ]'
+
+
+APP_MODULE = """import { NgModule } from '@angular/core';
+import { AppComponent } from './app.component';
+
+@NgModule({
+  // The declarations are not sorted
+  declarations: [
+    AppComponent,   /* the root */
+    HomeComponent
+  ],
+  imports: [ BrowserModule, AppRoutingModule ],
+  providers: [],
+  entryComponents: [],
+  bootstrap: [AppComponent]
+})
+export class AppModule { }
+"""
+
+
+def test_update_app_module_keeps_source(tmp_path):
+    from types import SimpleNamespace
+    from gencrud.generators.angular import updateAngularAppModuleTs
+    (tmp_path / 'app.module.ts').write_text(APP_MODULE)
+    config = SimpleNamespace(angular=SimpleNamespace(sourceFolder=str(tmp_path)),
+                             references=SimpleNamespace(app_module=SimpleNamespace(filename='app.module.ts'),
+                                                        app_routing=SimpleNamespace(module='AppRoutingModule')),
+                             options=SimpleNamespace(backupFiles=False))
+    app_module = {'files': ["import { RoleTableComponent } from './app/role/table.component';"],
+                  'declarations': ['RoleTableComponent'],
+                  'imports': ['HomeComponent', ''],
+                  'providers': ['RoleDataService'],
+                  'entryComponents': []}
+    updateAngularAppModuleTs(config, app_module, None)
+    assert (tmp_path / 'app.module.ts').read_text() == """import { NgModule } from '@angular/core';
+import { AppComponent } from './app.component';
+import { RoleTableComponent } from './app/role/table.component';
+
+@NgModule({
+  // The declarations are not sorted
+  declarations: [
+    AppComponent,   /* the root */
+    RoleTableComponent,
+    HomeComponent
+  ],
+  imports: [ BrowserModule, HomeComponent, AppRoutingModule ],
+  providers: [ RoleDataService ],
+  entryComponents: [],
+  bootstrap: [AppComponent]
+})
+export class AppModule { }
+"""